@@ -56,6 +56,13 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
+def __virtual__():
+    """
+    Only load when Azure SDK imports successfully.
+    """
+    return HAS_LIBS
+
+
 def create_or_update(
     name,
     resource_group,
@@ -112,21 +119,20 @@ def create_or_update(
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
 
     if source_vm:
-        # Use VM name to link to the IDs of existing VMs.
-        vm_instance = __salt__["azurerm_compute_virtual_machine.get"](
-            name=source_vm,
-            resource_group=(source_vm_group or resource_group),
-            log_level="info",
-            **kwargs,
-        )
-
-        if "error" in vm_instance:
+        # Use VM name to link to the IDs of existing VMs. Only the ID is needed, so the VM is not
+        # serialized into a dictionary.
+        try:
+            vm_id = compconn.virtual_machines.get(
+                resource_group_name=(source_vm_group or resource_group), vm_name=source_vm
+            ).id
+        except HttpResponseError as exc:
+            saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
             errmsg = "The source virtual machine could not be found."
             log.error(errmsg)
             result = {"error": errmsg}
             return result
 
-        source_vm = {"id": str(vm_instance["id"])}
+        source_vm = {"id": vm_id}
 
     spmodel = None
     if os_disk:
@@ -252,7 +258,7 @@ def get(name, resource_group, **kwargs):
     return result
 
 
-def list_(resource_group=None, **kwargs):
+def list_(resource_group=None, select=None, **kwargs):
     """
     .. versionadded:: 2.1.0
 
@@ -260,12 +266,20 @@ def list_(resource_group=None, **kwargs):
 
     :param resource_group: The name of the resource group to limit the results.
 
+    :param select: A comma-separated list of image properties to return, such as ``name,id,location``. The
+        properties are named as in the full image objects, and the name of each image is always returned. By
+        default, the full image objects are returned.
+
+        .. versionadded:: 4.2.0
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurerm_compute_image.list
 
+        salt-call azurerm_compute_image.list select="name,id"
+
     """
     result = {}
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
@@ -278,6 +292,10 @@ def list_(resource_group=None, **kwargs):
         else:
             images = saltext.azurerm.utils.azurerm.paged_object_to_list(compconn.images.list())
 
+        if select:
+            fields = {field.strip() for field in select.split(",")} | {"name"}
+            images = [{key: val for key, val in image.items() if key in fields} for image in images]
+
         for image in images:
             result[image["name"]] = image
     except HttpResponseError as exc:
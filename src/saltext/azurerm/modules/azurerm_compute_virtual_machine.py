@@ -32,23 +32,36 @@ Azure Resource Manager (ARM) Compute Virtual Machine Execution Module
         * ``AZURE_CHINA_CLOUD``
         * ``AZURE_US_GOV_CLOUD``
         * ``AZURE_GERMAN_CLOUD``
+
+    Functions which wait on long-running operations also accept a **polling_interval** parameter, which sets the
+    number of seconds to wait between status checks (default: 5). A shorter delay requested by the service is
+    honored, but a longer one is not.
 """
 
 # Python libs
+import base64
+import functools
+import importlib
 import logging
 import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import saltext.azurerm.utils.azurerm
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.compute.models  # pylint: disable=unused-import
+    # The compute models are imported on demand, since loading them is by far the most expensive
+    # part of importing this module.
+    from azure.core.exceptions import DeserializationError
     from azure.core.exceptions import HttpResponseError
     from azure.core.exceptions import ResourceNotFoundError
     from azure.core.exceptions import SerializationError
     from azure.mgmt.core.tools import is_valid_resource_id
     from azure.mgmt.core.tools import parse_resource_id
+    from azure.mgmt.core.tools import resource_id
 
     HAS_LIBS = True
 except ImportError:
@@ -58,6 +71,417 @@ __func_alias__ = {"list_": "list"}
 
 log = logging.getLogger(__name__)
 
+# The maximum number of seconds between status checks of long-running operations
+_DEFAULT_POLLING_INTERVAL = 5
+
+# Options of the polling methods of operations which do not use the default options of the SDK
+_LRO_OPTIONS = {
+    "assess_patches": {"final-state-via": "location"},
+    "capture": {"final-state-via": "location"},
+}
+
+# Keys accepted in the dictionaries passed to the data_disks parameter of create_or_update
+_ALLOWED_DATA_DISK_KEYS = frozenset(
+    (
+        "lun",
+        "name",
+        "vhd",
+        "image",
+        "caching",
+        "write_accerator_enabled",
+        "create_option",
+        "disk_size_gb",
+        "managed_disk",
+        "to_be_detached",
+    )
+)
+
+# Parameters which every virtual machine passed to bulk_create_or_update must have
+_BULK_REQUIRED_KEYS = ("name", "resource_group", "vm_size")
+
+# Pairs of create_or_update parameters referencing resources which may not be specified together
+_EXCLUSIVE_REFERENCES = (
+    ("availability_set", "virtual_machine_scale_set"),
+    ("host", "host_group"),
+)
+
+# Keys of the image reference built from an image passed as a "publisher|offer|sku|version" string
+_IMAGE_REFERENCE_KEYS = ("publisher", "offer", "sku", "version")
+
+# The maximum size of the extension settings accepted by Azure, which limits the size of a local userdata file
+_USERDATA_MAX_BYTES = 256 * 1024
+# The connection parameters passed on to the virtual machine extension module
+_EXTENSION_AUTH_KWARGS = (
+    "tenant",
+    "client_id",
+    "secret",
+    "subscription_id",
+    "username",
+    "password",
+)
+
+# The (publisher, type, handler version) of the custom script extension, keyed by whether the virtual machine is Linux
+_CUSTOM_SCRIPT_EXTENSIONS = {
+    True: ("Microsoft.Azure.Extensions", "CustomScript", "2.0"),
+    False: ("Microsoft.Compute", "CustomScriptExtension", "1.8"),
+}
+
+# The (type, handler version) of the disk encryption extension, keyed by whether the virtual machine is Linux
+_DISK_ENCRYPTION_EXTENSIONS = {
+    True: ("AzureDiskEncryptionForLinux", "1.1"),
+    False: ("AzureDiskEncryption", "2.2"),
+}
+
+# Virtual machine properties which are never returned by the service, and so cannot be compared
+_WRITE_ONLY_KEYS = frozenset(("admin_password", "custom_data"))
+# Virtual machine properties whose current value is replaced as a whole, so they have to match exactly
+_REPLACED_KEYS = frozenset(("tags",))
+
+# Local userdata files larger than this are passed to the Linux custom script extension base64 encoded in the protected
+# settings instead of as the command to execute
+_USERDATA_INLINE_BYTES = 64 * 1024
+
+# Resource group locations, keyed by subscription ID and (case-insensitive) resource group name, along with the
+# time they were looked up
+_RG_LOCATION_CACHE = {}
+_RG_LOCATION_TTL = 300
+
+_RESOURCE_GROUP_API_VERSION = "2021-04-01"
+_KEYVAULT_API_VERSION = "2022-07-01"
+
+
+def _polling(operation, polling_interval):
+    """
+    Build the polling method for a long-running virtual machine operation. Status checks occur every
+    ``polling_interval`` seconds, and the service cannot extend that with a longer Retry-After header.
+    """
+    return saltext.azurerm.utils.azurerm.ClampedARMPolling(
+        timeout=polling_interval,
+        max_delay=polling_interval,
+        lro_options=_LRO_OPTIONS.get(operation),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _compute_model(name):
+    """
+    Look up a compute model class by name. The models are only imported on first use, and the lookup is memoized.
+    """
+    return getattr(importlib.import_module("azure.mgmt.compute.models"), name)
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_valid_resource_id(rid):
+    """
+    Memoized wrapper around ``is_valid_resource_id``, since the same IDs are validated repeatedly when provisioning
+    many virtual machines into the same sets, hosts, or from the same image.
+    """
+    return is_valid_resource_id(rid)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_resource_id_parts(rid):
+    return parse_resource_id(rid)
+
+
+def _parse_resource_id(rid):
+    """
+    Memoized wrapper around ``parse_resource_id``, since the IDs of the same disks and interfaces are parsed several
+    times while creating and deleting a virtual machine. A copy is returned so the cached result cannot be modified.
+    """
+    return dict(_cached_resource_id_parts(rid))
+
+
+def _pruned(params):
+    """
+    Return a copy of a dictionary without the keys whose values are None or an empty dictionary.
+    """
+    return {key: val for key, val in params.items() if val is not None and val != {}}
+
+
+def _matches(desired, current, replaced_keys=frozenset()):
+    """
+    Check whether all of the values of a desired configuration are present in the current configuration of a resource.
+    Strings are compared case-insensitively, since the service normalizes the case of many of the values it returns.
+    The values of ``replaced_keys`` must be equal instead, with a missing value being equal to an empty one.
+    """
+    if isinstance(desired, dict):
+        return (
+            isinstance(current, dict)
+            and all((desired.get(key) or {}) == (current.get(key) or {}) for key in replaced_keys)
+            and all(
+                key in _WRITE_ONLY_KEYS or key in replaced_keys or _matches(val, current.get(key))
+                for key, val in desired.items()
+            )
+        )
+    if isinstance(desired, list):
+        return (
+            isinstance(current, list)
+            and len(desired) == len(current)
+            and all(_matches(val, cur) for val, cur in zip(desired, current))
+        )
+    if isinstance(desired, str) and isinstance(current, str):
+        return desired.lower() == current.lower()
+    return desired == current
+
+
+def _load_pubkey(pubkey):
+    """
+    Return the contents of an SSH public key file. Anything which cannot be opened as a file is treated as inline key
+    material. ``None`` is returned for key files which exist but cannot be read.
+    """
+    try:
+        with open(pubkey, "rb") as pubkey_file:
+            return pubkey_file.read().decode("utf-8", "replace").rstrip()
+    except PermissionError as exc:
+        log.error("Unable to open ssh public key file: %s (%s)", pubkey, exc)
+        return None
+    except (OSError, ValueError):
+        return pubkey
+
+
+def _read_userdata_file(userdata_file, is_linux):
+    """
+    Read a local userdata file for the custom script extension. Returns a tuple of the script to execute as a command,
+    and the base64 encoded script to pass in the protected settings instead, which is used for large files on Linux. Both
+    are None if the file is missing, too large, or cannot be read.
+    """
+    try:
+        file_stat = os.stat(userdata_file)
+    except OSError:
+        return None, None
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        return None, None
+
+    if file_stat.st_size > _USERDATA_MAX_BYTES:
+        log.error(
+            "The userdata file %s exceeds the %s byte limit of the custom script extension.",
+            userdata_file,
+            _USERDATA_MAX_BYTES,
+        )
+        return None, None
+
+    try:
+        with open(userdata_file, "rb") as udf_:
+            if is_linux and file_stat.st_size > _USERDATA_INLINE_BYTES:
+                # encode chunks of a multiple of 3 bytes, so the encoded chunks can be joined without padding in between
+                chunks = iter(functools.partial(udf_.read, 3 * 16384), b"")
+                return None, b"".join(base64.b64encode(chunk) for chunk in chunks).decode("ascii")
+            return udf_.read().decode("utf-8"), None
+    except (OSError, UnicodeDecodeError) as exc:
+        log.error("Unable to open userdata file: %s (%s)", userdata_file, exc)
+
+    return None, None
+
+
+def _prefetch(compconn, resource_group, location=None, disk_enc_keyvault=None, **kwargs):
+    """
+    Look up the referenced resources required to build a virtual machine with a single batch request. Resource group
+    locations are cached for a few minutes in order to avoid a request per virtual machine when provisioning many
+    virtual machines into the same resource group. No lookup is made for the location if one was already passed.
+
+    Returns a dictionary which may contain the ``location`` of the resource group and the ``vault_uri`` of the disk
+    encryption key vault.
+    """
+    subscription_id = compconn._config.subscription_id  # pylint: disable=protected-access
+    ret = {}
+    lookups = {}
+
+    if location:
+        ret["location"] = location
+    else:
+        cache_key = (subscription_id, resource_group.lower())
+        cached = _RG_LOCATION_CACHE.get(cache_key)
+        if cached and time.monotonic() - cached[1] < _RG_LOCATION_TTL:
+            ret["location"] = cached[0]
+        else:
+            lookups["location"] = (
+                f"/subscriptions/{subscription_id}/resourcegroups/{resource_group}"
+                f"?api-version={_RESOURCE_GROUP_API_VERSION}"
+            )
+
+    if disk_enc_keyvault and _is_valid_resource_id(disk_enc_keyvault):
+        lookups["vault_uri"] = f"{disk_enc_keyvault}?api-version={_KEYVAULT_API_VERSION}"
+
+    if not lookups:
+        return ret
+
+    try:
+        responses = saltext.azurerm.utils.azurerm.batch_get(list(lookups.values()), **kwargs)
+    except HttpResponseError as exc:
+        saltext.azurerm.utils.azurerm.log_cloud_error("resource", exc, kwargs)
+        return ret
+
+    for key, response in zip(lookups, responses):
+        if "error" in response:
+            log.debug("Unable to look up the %s for virtual machine creation: %s", key, response)
+        elif key == "location":
+            ret["location"] = response["location"]
+            _RG_LOCATION_CACHE[cache_key] = (response["location"], time.monotonic())
+        else:
+            ret["vault_uri"] = response.get("properties", {}).get("vaultUri")
+
+    return ret
+
+
+def _apply_disk_encryption(
+    name,
+    resource_group,
+    location,
+    is_linux,
+    keyvault,
+    volume_type,
+    keyvault_url=None,
+    kek_url=None,
+    **kwargs,
+):
+    """
+    Install the Azure Disk Encryption extension on a virtual machine once it has been deployed. Returns True if the
+    extension was requested successfully.
+    """
+    try:
+        if not keyvault_url:
+            keyvault_url = f"https://{_parse_resource_id(keyvault)['name']}.vault.azure.net/"
+
+        settings = {
+            "VolumeType": volume_type,
+            "EncryptionOperation": "EnableEncryption",
+            "KeyVaultResourceId": keyvault,
+            "KeyVaultURL": keyvault_url,
+        }
+        if kek_url:
+            settings["KeyEncryptionKeyURL"] = kek_url
+            settings["KekVaultResourceId"] = keyvault
+
+        extension_type, version = _DISK_ENCRYPTION_EXTENSIONS[is_linux]
+
+        __salt__["azurerm_compute_virtual_machine_extension.create_or_update"](
+            name="DiskEncryption",
+            vm_name=name,
+            resource_group=resource_group,
+            location=location,
+            publisher="Microsoft.Azure.Security",
+            extension_type=extension_type,
+            version=version,
+            settings=settings,
+            **kwargs,
+        )
+    except KeyError as exc:
+        log.error("An error occured while trying to enable disk encryption: %s", (str(exc)))
+        return False
+
+    return True
+
+
+def _create_network_interface(
+    name,
+    resource_group,
+    subnet,
+    virtual_network,
+    network_resource_group=None,
+    allocate_public_ip=False,
+    **kwargs,
+):
+    """
+    Create the network interface of a virtual machine, along with its public IP address if requested. Returns a
+    network interface reference, or a dictionary containing an ``error`` key.
+    """
+    ipc = {"name": f"{name}-nic0-cfg0"}
+
+    if allocate_public_ip:
+        pubip = __salt__["azurerm_network.public_ip_address_create_or_update"](
+            f"{name}-pip0", resource_group, **kwargs
+        )
+
+        try:
+            ipc.update({"public_ip_address": {"id": pubip["id"]}})
+        except KeyError as exc:
+            return {"error": f"The public IP address could not be created. ({str(exc)})"}
+
+    iface = __salt__["azurerm_network.network_interface_create_or_update"](
+        f"{name}-nic0",
+        [ipc],
+        subnet,
+        virtual_network,
+        network_resource_group or resource_group,
+        **kwargs,
+    )
+
+    try:
+        return {"id": iface["id"]}
+    except KeyError as exc:
+        return {"error": f"The network interface could not be created. ({str(exc)})"}
+
+
+def _get_network_interfaces(ifaces, **kwargs):
+    """
+    Look up the details of a list of network interface references with a single batch request. Any interfaces which
+    could not be retrieved that way are looked up individually, and concurrently. The details are returned in the same
+    order as the references.
+    """
+    details = [None] * len(ifaces)
+
+    if ifaces:
+        try:
+            netconn = saltext.azurerm.utils.azurerm.get_client("network", **kwargs)
+            api_version = saltext.azurerm.utils.azurerm.get_api_version(
+                netconn, "network_interfaces"
+            )
+            responses = saltext.azurerm.utils.azurerm.batch_get(
+                [f"{iface['id']}?api-version={api_version}" for iface in ifaces], **kwargs
+            )
+            network_interface_model = netconn.models(api_version).NetworkInterface
+            for index, response in enumerate(responses):
+                if "error" not in response:
+                    details[index] = network_interface_model.deserialize(response).as_dict()
+        except (HttpResponseError, DeserializationError) as exc:
+            log.debug("Unable to look up the network interfaces with a batch request: %s", exc)
+
+    missing = [index for index, detail in enumerate(details) if detail is None]
+    if missing:
+        network_interface_get = __salt__["azurerm_network.network_interface_get"]
+
+        def _get(index):
+            iface_dict = _parse_resource_id(ifaces[index]["id"])
+            return network_interface_get(
+                resource_group=iface_dict["resource_group"],
+                name=iface_dict["name"],
+                **kwargs,
+            )
+
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+            for index, detail in zip(missing, executor.map(_get, missing)):
+                details[index] = detail
+
+    return details
+
+
+def _vm_action(
+    operation, name, resource_group, return_result=False, operation_kwargs=None, **kwargs
+):
+    """
+    Run a long-running virtual machine operation, such as ``start`` or ``restart``, and wait for it to finish. Returns the
+    result of the operation as a dictionary if ``return_result`` is set, or True otherwise.
+    """
+    polling_interval = kwargs.pop("polling_interval", _DEFAULT_POLLING_INTERVAL)
+    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+
+    try:
+        poller = getattr(compconn.virtual_machines, f"begin_{operation}")(
+            resource_group_name=resource_group,
+            vm_name=name,
+            polling=_polling(operation, polling_interval),
+            **(operation_kwargs or {}),
+        )
+        poller.wait()
+        result = poller.result().as_dict() if return_result else True
+    except HttpResponseError as exc:
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
+        result = {"error": str(exc)}
+
+    return result
+
 
 def create_or_update(
     name,
@@ -108,6 +532,7 @@ def create_or_update(
     host=None,
     host_group=None,
     extensions_time_budget=None,
+    wait=True,
     **kwargs,
 ):  # pylint: disable=too-many-arguments
     """
@@ -115,6 +540,11 @@ def create_or_update(
 
     Create or update a virtual machine.
 
+    If the virtual machine already exists with all of the requested settings, it is returned without being updated.
+    Its network interface and public IP address are not created or updated either, and the userdata and disk
+    encryption extensions are not applied again. The tags of the virtual machine have to match the ``tags`` parameter
+    exactly, so a virtual machine with tags which are not requested is updated.
+
     :param name: The virtual machine to create.
 
     :param resource_group: The resource group name assigned to the virtual machine.
@@ -224,7 +654,9 @@ def create_or_update(
         location of https://raw.githubusercontent.com/saltstack/salt-bootstrap/stable/bootstrap-salt.sh is used then the
         userdata parameter would contain "./bootstrap-salt.sh" along with any desired arguments. Note that PowerShell
         execution policy may cause issues here. For PowerShell files, considered signed scripts or the more insecure
-        "powershell -ExecutionPolicy Unrestricted -File ./bootstrap-salt.ps1" addition to the command.
+        "powershell -ExecutionPolicy Unrestricted -File ./bootstrap-salt.ps1" addition to the command. Local files
+        may be at most 256 KiB. On Linux, local files larger than 64 KiB are passed to the extension as a base64 encoded
+        script in its protected settings.
 
     :param userdata: This parameter is used to pass text to be executed on a system. The native shell will be used on a
         given host operating system.
@@ -274,6 +706,14 @@ def create_or_update(
         between 15 minutes and 120 minutes (inclusive) and should be specified in ISO 8601 format. The default value is
         90 minutes (PT1H30M).
 
+    :param wait: (Default: True) Wait for the virtual machine deployment to complete before returning. If set to
+        False, the function returns as soon as the deployment has been accepted, with the name, resource group, and
+        current provisioning status of the virtual machine. Post-deployment steps which require a running virtual
+        machine (userdata and disk encryption extensions) are skipped in that case. The provisioning state can be
+        checked later with the ``get`` function.
+
+        .. versionadded:: 4.2.0
+
     Virtual Machine Disk Encryption:
         If you would like to enable disk encryption within the virtual machine you must set the enable_disk_enc
         parameter to True. Disk encryption utilizes a VM published by Microsoft.Azure.Security of extension type
@@ -335,18 +775,28 @@ def create_or_update(
         salt-call azurerm_compute_virtual_machine.create_or_update test_vm test_group
 
     """
-    if "location" not in kwargs:
-        rg_props = __salt__["azurerm_resource.resource_group_get"](resource_group, **kwargs)
-
-        if "error" in rg_props:
-            log.error("Unable to determine location from resource group specified.")
-            return {"error": "Unable to determine location from resource group specified."}
-        kwargs["location"] = rg_props["location"]
-
     result = {}
+    polling_interval = kwargs.pop("polling_interval", _DEFAULT_POLLING_INTERVAL)
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
 
-    params = kwargs.copy()
+    prefetched = _prefetch(
+        compconn,
+        resource_group,
+        disk_enc_keyvault=(disk_enc_keyvault if enable_disk_enc else None),
+        **kwargs,
+    )
+
+    if not prefetched.get("location"):
+        log.error("Unable to determine location from resource group specified.")
+        return {"error": "Unable to determine location from resource group specified."}
+    kwargs["location"] = prefetched["location"]
+
+    # Only keyword arguments which are attributes of the VirtualMachine model are passed through, which keeps the
+    # connection parameters out of the request.
+    vm_attributes = _compute_model(
+        "VirtualMachine"
+    )._attribute_map  # pylint: disable=protected-access
+    params = {key: val for key, val in kwargs.items() if key in vm_attributes and val is not None}
 
     # This section creates dictionaries if required in order to properly create SubResource objects
     if os_managed_disk and not isinstance(os_managed_disk, dict):
@@ -361,66 +811,39 @@ def create_or_update(
     if not network_interfaces:
         network_interfaces = []
 
-    # network interface creation
-    if not network_interfaces and create_interfaces:
-        ipc = {"name": f"{name}-nic0-cfg0"}
-
-        if allocate_public_ip:
-            pubip = __salt__["azurerm_network.public_ip_address_create_or_update"](
-                f"{name}-pip0", resource_group, **kwargs
-            )
-
-            try:
-                ipc.update({"public_ip_address": {"id": pubip["id"]}})
-            except KeyError as exc:
-                result = {"error": f"The public IP address could not be created. ({str(exc)})"}
-                return result
-
-        iface = __salt__["azurerm_network.network_interface_create_or_update"](
-            f"{name}-nic0",
-            [ipc],
-            subnet,
-            virtual_network,
-            network_resource_group or resource_group,
-            **kwargs,
+    # network interface creation is deferred until it is known that the virtual machine has to be created or updated.
+    # until then, the ID the network interface will have is used in the configuration.
+    create_nic = not network_interfaces and create_interfaces
+    if create_nic:
+        network_interfaces.append(
+            {
+                "id": resource_id(
+                    subscription=compconn._config.subscription_id,  # pylint: disable=protected-access
+                    resource_group=network_resource_group or resource_group,
+                    namespace="Microsoft.Network",
+                    type="networkInterfaces",
+                    name=f"{name}-nic0",
+                )
+            }
         )
 
-        try:
-            nic = {"id": iface["id"]}
-        except KeyError as exc:
-            result = {"error": f"The network interface could not be created. ({str(exc)})"}
-            return result
-
-        network_interfaces.append(nic)
-
     # default os disk name
     if not os_disk_name and os_disk_simplename:
         os_disk_name = f"{name}-osdisk0"
 
-    # data disks
-    if not data_disks:
-        data_disks = []
+    # data disks. entries that are not dictionaries are dropped from the list instead of halting, since
+    # disks can always be attached after the fact.
+    valid_data_disks = []
+    for index, data_disk in enumerate(data_disks or []):
+        if isinstance(data_disk, dict):
+            valid_data_disks.append(data_disk)
+        else:
+            log.warning("The data disk at index %s is not a dictionary: %s", index, data_disk)
+    data_disks = valid_data_disks
 
     for lun, data_disk in enumerate(data_disks):
-        if not isinstance(data_disk, dict):
-            log.warning("The data disk at index %s is not a dictionary: %s", lun, data_disk)
-            # drop from the list instead of halting. disks can always be attached after the fact.
-            data_disks.pop(lun)
-            continue
         # restrict allowable keys
-        allowable = (
-            "lun",
-            "name",
-            "vhd",
-            "image",
-            "caching",
-            "write_accerator_enabled",
-            "create_option",
-            "disk_size_gb",
-            "managed_disk",
-            "to_be_detached",
-        )
-        data_disk = {key: val for key, val in data_disk.items() if key in allowable}
+        data_disk = {key: val for key, val in data_disk.items() if key in _ALLOWED_DATA_DISK_KEYS}
 
         # set defaults
         data_disk.setdefault("lun", lun)
@@ -449,183 +872,133 @@ def create_or_update(
         if data_disk["create_option"] == "empty":
             data_disk.setdefault("disk_size_gb", 10)
 
-        log.debug("Data disk with lun %s = %s", lun, data_disk)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Data disk with lun %s = %s", lun, data_disk)
         data_disks[lun] = data_disk
 
-    # main configuration parameters
-    params.update(
+    # main configuration parameters. unset values are left out so that they are neither modelled nor serialized.
+    # "plan": {
+    #    "name" None,
+    #    "publisher": None,
+    #    "product": None,
+    #    "promotion_code": None
+    # },
+    params["hardware_profile"] = {"vm_size": vm_size.lower()}
+    storage_profile = params["storage_profile"] = {
+        "os_disk": _pruned(
+            {
+                "os_type": os_type,
+                "name": os_disk_name,
+                "vhd": os_disk_vhd_uri,
+                "image": os_disk_image_uri,
+                "caching": os_disk_caching,
+                "write_accelerator_enabled": os_write_accel,
+                "create_option": os_disk_create_option,
+                "disk_size_gb": os_disk_size_gb,
+                "managed_disk": os_managed_disk,
+            }
+        ),
+        "data_disks": data_disks,
+    }
+    os_profile = params["os_profile"] = _pruned(
         {
-            # "plan": {
-            #    "name" None,
-            #    "publisher": None,
-            #    "product": None,
-            #    "promotion_code": None
-            # },
-            "hardware_profile": {
-                "vm_size": vm_size.lower(),
-            },
-            "storage_profile": {
-                "os_disk": {
-                    "os_type": os_type,
-                    "name": os_disk_name,
-                    "vhd": os_disk_vhd_uri,
-                    "image": os_disk_image_uri,
-                    "caching": os_disk_caching,
-                    "write_accelerator_enabled": os_write_accel,
-                    "create_option": os_disk_create_option,
-                    "disk_size_gb": os_disk_size_gb,
-                    "managed_disk": os_managed_disk,
-                },
-                "data_disks": data_disks,
-            },
-            "os_profile": {
-                "computer_name": name,
-                "admin_username": admin_username,
-                "admin_password": admin_password,
-                "custom_data": custom_data,
-                #    "secrets": None,
-                "allow_extension_operations": allow_extensions,
-            },
-            "network_profile": {
-                "network_interfaces": network_interfaces,
-            },
-            "diagnostics_profile": {
-                "boot_diagnostics": {
-                    "enabled": boot_diags_enabled,
-                    "storage_uri": diag_storage_uri,
-                }
-            },
-            "extensions_time_budget": extensions_time_budget,
-            # "identity": {
-            #    "type": None, # SystemAssigned or UserAssigned
-            #    "user_assigned_identities": None # VirtualMachineIdentityUserAssignedIdentitiesValue
-            # },
+            "computer_name": name,
+            "admin_username": admin_username,
+            "admin_password": admin_password,
+            "custom_data": custom_data,
+            #    "secrets": None,
+            "allow_extension_operations": allow_extensions,
         }
     )
+    params["network_profile"] = {"network_interfaces": network_interfaces}
+    boot_diagnostics = _pruned({"enabled": boot_diags_enabled, "storage_uri": diag_storage_uri})
+    if boot_diagnostics:
+        params["diagnostics_profile"] = {"boot_diagnostics": boot_diagnostics}
+    if extensions_time_budget is not None:
+        params["extensions_time_budget"] = extensions_time_budget
+    # "identity": {
+    #    "type": None, # SystemAssigned or UserAssigned
+    #    "user_assigned_identities": None # VirtualMachineIdentityUserAssignedIdentitiesValue
+    # },
 
     if isinstance(ssh_public_keys, list):
-        pubkeys = []
-        for pubkey in ssh_public_keys:
-            if os.path.isfile(pubkey):
-                try:
-                    with open(pubkey, encoding="utf-8") as pubkey_file:
-                        pubkeys.append(
-                            {
-                                "key_data": pubkey_file.read(),
-                                "path": f"/home/{admin_username}/.ssh/authorized_keys",
-                            }
-                        )
-                except FileNotFoundError as exc:
-                    log.error("Unable to open ssh public key file: %s (%s)", pubkey, exc)
-            else:
-                pubkeys.append(
-                    {
-                        "key_data": pubkey,
-                        "path": f"/home/{admin_username}/.ssh/authorized_keys",
-                    }
-                )
-
-        params["os_profile"].update(
-            {
-                "linux_configuration": {
-                    "disable_password_authentication": disable_password_auth,
-                    "ssh": {"public_keys": pubkeys},
-                }
-            }
-        )
-
-    if availability_set and virtual_machine_scale_set:
-        log.error(
-            "The availability_set and virtual_machine_scale_set parameters have both been specified. "
-            "Only one of those two parameters may be specified during creation. "
-            "Both parameters will now be ignored during execution."
-        )
-        availability_set = None
-        virtual_machine_scale_set = None
-
-    if availability_set:
-        if is_valid_resource_id(availability_set):
-            params["availability_set"] = {"id": availability_set}
-        else:
-            log.error(
-                "The resource ID passed within the availability_set parameter is invalid and will be ignored."
-            )
-    elif virtual_machine_scale_set:
-        if is_valid_resource_id(virtual_machine_scale_set):
-            params["virtual_machine_scale_set"] = {"id": virtual_machine_scale_set}
-        else:
-            log.error(
-                "The resource ID passed within the virtual_machine_scale_set parameter is invalid and will be ignored."
-            )
-
-    if host and host_group:
-        log.error(
-            "The host and host_group parameters have both been specified. "
-            "Only one of those two parameters may be specified. "
-            "Both parameters will now be ignored during execution."
-        )
-        host = None
-        host_group = None
+        # keys are read concurrently, since each one may be a file on a slow filesystem
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(ssh_public_keys)))) as executor:
+            key_data = list(executor.map(_load_pubkey, ssh_public_keys))
+
+        pubkeys = [
+            {"key_data": data, "path": f"/home/{admin_username}/.ssh/authorized_keys"}
+            for data in key_data
+            if data is not None
+        ]
+
+        os_profile["linux_configuration"] = {
+            "disable_password_authentication": disable_password_auth,
+            "ssh": {"public_keys": pubkeys},
+        }
 
-    if host:
-        if is_valid_resource_id(host):
-            params["host"] = {"id": host}
-        else:
-            log.error(
-                "The resource ID passed within the host parameter is invalid and will be ignored."
-            )
-    elif host_group:
-        if is_valid_resource_id(host_group):
-            params["host_group"] = {"id": host_group}
-        else:
+    # resources referenced by ID. mutually exclusive references are both ignored if both have been specified.
+    references = {
+        "availability_set": availability_set,
+        "virtual_machine_scale_set": virtual_machine_scale_set,
+        "host": host,
+        "host_group": host_group,
+        "proximity_placement_group": proximity_placement_group,
+    }
+    for first, second in _EXCLUSIVE_REFERENCES:
+        if references[first] and references[second]:
             log.error(
-                "The resource ID passed within the host_group parameter is invalid and will be ignored."
+                "The %s and %s parameters have both been specified. "
+                "Only one of those two parameters may be specified. "
+                "Both parameters will now be ignored during execution.",
+                first,
+                second,
             )
+            references[first] = references[second] = None
 
-    if proximity_placement_group:
-        if is_valid_resource_id(proximity_placement_group):
-            params["proximity_placement_group"] = {"id": proximity_placement_group}
+    for reference, ref_id in references.items():
+        if not ref_id:
+            continue
+        if _is_valid_resource_id(ref_id):
+            params[reference] = {"id": ref_id}
         else:
             log.error(
-                "The resource ID passed within the proximity_placement_group parameter is invalid and will be ignored."
+                "The resource ID passed within the %s parameter is invalid and will be ignored.",
+                reference,
             )
 
     if image:
-        if is_valid_resource_id(image):
-            params["storage_profile"].update({"image_reference": {"id": image}})
+        if _is_valid_resource_id(image):
+            storage_profile["image_reference"] = {"id": image}
         elif "|" in image:
-            image_keys = ["publisher", "offer", "sku", "version"]
-            params["storage_profile"].update(
-                {"image_reference": dict(zip(image_keys, image.split("|")))}
+            storage_profile["image_reference"] = dict(
+                zip(_IMAGE_REFERENCE_KEYS, image.split("|", 3))
             )
 
     if time_zone or enable_automatic_updates is not None:
-        if "windows_configuration" not in params["os_profile"]:
-            params["os_profile"]["windows_configuration"] = {}
+        if "windows_configuration" not in os_profile:
+            os_profile["windows_configuration"] = {}
         if enable_automatic_updates:
-            params["os_profile"]["windows_configuration"][
+            os_profile["windows_configuration"][
                 "enable_automatic_updates"
             ] = enable_automatic_updates
         if time_zone:
-            params["os_profile"]["windows_configuration"]["time_zone"] = time_zone
+            os_profile["windows_configuration"]["time_zone"] = time_zone
 
     if not provision_vm_agent:
-        if "linux_configuration" in params["os_profile"]:
-            params["os_profile"]["linux_configuration"]["provision_vm_agent"] = provision_vm_agent
-        elif "windows_configuration" in params["os_profile"]:
-            params["os_profile"]["windows_configuration"]["provision_vm_agent"] = provision_vm_agent
+        if "linux_configuration" in os_profile:
+            os_profile["linux_configuration"]["provision_vm_agent"] = provision_vm_agent
+        elif "windows_configuration" in os_profile:
+            os_profile["windows_configuration"]["provision_vm_agent"] = provision_vm_agent
         elif os_type:
-            if "linux" in os_type.lower():
-                params["os_profile"]["linux_configuration"] = {
-                    "provision_vm_agent": provision_vm_agent
-                }
-            elif "windows" in os_type.lower():
-                params["os_profile"]["windows_configuration"] = {
-                    "provision_vm_agent": provision_vm_agent
-                }
+            os_family = os_type.lower()
+            if "linux" in os_family:
+                os_profile["linux_configuration"] = {"provision_vm_agent": provision_vm_agent}
+            elif "windows" in os_family:
+                os_profile["windows_configuration"] = {"provision_vm_agent": provision_vm_agent}
 
     if os_ephemeral_disk:
-        params["storage_profile"]["diff_disk_settings"] = {"option": "local"}
+        storage_profile["diff_disk_settings"] = {"option": "local"}
 
     if max_price:
         params["billing_profile"] = {"max_price": max_price}
@@ -642,51 +1015,82 @@ def create_or_update(
         return result
 
     try:
+        # a virtual machine which is already configured as requested is not updated, which avoids waiting on a
+        # long-running operation that would not change anything
+        try:
+            current = compconn.virtual_machines.get(
+                resource_group_name=resource_group, vm_name=name
+            )
+        except ResourceNotFoundError:
+            current = None
+
+        if current is not None and _matches(
+            vmmodel.as_dict(), current.as_dict(), replaced_keys=_REPLACED_KEYS
+        ):
+            log.debug("Virtual machine %s is already in the desired state.", name)
+            result = current.as_dict()
+            result["network_profile"]["network_interfaces"] = _get_network_interfaces(
+                result["network_profile"]["network_interfaces"], **kwargs
+            )
+            return result
+
+        if create_nic:
+            nic = _create_network_interface(
+                name,
+                resource_group,
+                subnet,
+                virtual_network,
+                network_resource_group=network_resource_group,
+                allocate_public_ip=allocate_public_ip,
+                **kwargs,
+            )
+            if "error" in nic:
+                return nic
+            vmmodel.network_profile.network_interfaces[0].id = nic["id"]
+
         # pylint: disable=invalid-name
         vm = compconn.virtual_machines.begin_create_or_update(
-            resource_group_name=resource_group, vm_name=name, parameters=vmmodel
+            resource_group_name=resource_group,
+            vm_name=name,
+            polling=_polling("create_or_update", polling_interval),
+            parameters=vmmodel,
         )
 
+        if not wait:
+            if userdata or userdata_file or enable_disk_enc:
+                log.warning(
+                    "Extensions for virtual machine %s are not applied when not waiting for the deployment.",
+                    name,
+                )
+            return {"name": name, "resource_group": resource_group, "status": vm.status()}
+
         vm.wait()
         result = vm.result().as_dict()
 
         # Extract connection auth values for virtual machine extensions
-        auth_kwargs = (
-            "tenant",
-            "client_id",
-            "secret",
-            "subscription_id",
-            "username",
-            "password",
-        )
-        connection_profile = {x: kwargs[x] for x in auth_kwargs if x in kwargs}
+        connection_profile = {x: kwargs[x] for x in _EXTENSION_AUTH_KWARGS if x in kwargs}
         is_linux = result["storage_profile"]["os_disk"]["os_type"] == "Linux"
-        extension_info = {}
 
         # attach custom script extension for userdata
         if (userdata or userdata_file) and provision_vm_agent:
-            if is_linux:
-                extension_info["publisher"] = "Microsoft.Azure.Extensions"
-                extension_info["version"] = "2.0"
-                extension_info["type"] = "CustomScript"
-            else:
-                extension_info["publisher"] = "Microsoft.Compute"
-                extension_info["version"] = "1.8"
-                extension_info["type"] = "CustomScriptExtension"
-
-            extension_info["settings"] = {}
+            publisher, extension_type, version = _CUSTOM_SCRIPT_EXTENSIONS[is_linux]
+            settings = {}
+            protected_settings = None
+            script = None
             if userdata_file:
                 if userdata_file.startswith("http"):
-                    extension_info["settings"]["fileUris"] = [userdata_file]
-                elif os.path.isfile(userdata_file):
-                    try:
-                        with open(userdata_file, encoding="utf-8") as udf_:
-                            userdata = udf_.read()
-                    except FileNotFoundError as exc:
-                        log.error("Unable to open userdata file: %s (%s)", userdata, exc)
-            extension_info["settings"]["commandToExecute"] = userdata
-
-            if userdata:
+                    settings["fileUris"] = [userdata_file]
+                else:
+                    contents, script = _read_userdata_file(userdata_file, is_linux)
+                    if contents is not None:
+                        userdata = contents
+
+            if script:
+                protected_settings = {"script": script}
+            else:
+                settings["commandToExecute"] = userdata
+
+            if userdata or script:
                 userdata_ret = __salt__[
                     "azurerm_compute_virtual_machine_extension.create_or_update"
                 ](
@@ -694,77 +1098,35 @@ def create_or_update(
                     vm_name=name,
                     resource_group=resource_group,
                     location=result["location"],
-                    publisher=extension_info["publisher"],
-                    extension_type=extension_info["type"],
-                    version=extension_info["version"],
-                    settings=extension_info["settings"],
+                    publisher=publisher,
+                    extension_type=extension_type,
+                    version=version,
+                    settings=settings,
+                    protected_settings=protected_settings,
                     **connection_profile,
                 )
                 log.debug("Return from userdata extension: %s", userdata_ret)
 
         # attach disk encryption extension
         if enable_disk_enc and provision_vm_agent and disk_enc_keyvault and disk_enc_volume_type:
-            try:
-                disk_enc_keyvault_name = (parse_resource_id(disk_enc_keyvault))["name"]
-                disk_enc_keyvault_url = f"https://{disk_enc_keyvault_name}.vault.azure.net/"
-
-                extension_info = {
-                    "publisher": "Microsoft.Azure.Security",
-                    "settings": {
-                        "VolumeType": disk_enc_volume_type,
-                        "EncryptionOperation": "EnableEncryption",
-                        "KeyVaultResourceId": disk_enc_keyvault,
-                        "KeyVaultURL": disk_enc_keyvault_url,
-                    },
-                }
-
-                if is_linux:
-                    extension_info["type"] = "AzureDiskEncryptionForLinux"
-                    extension_info["version"] = "1.1"
-                else:
-                    extension_info["type"] = "AzureDiskEncryption"
-                    extension_info["version"] = "2.2"
-
-                if disk_enc_kek_url:
-                    extension_info["settings"]["KeyEncryptionKeyURL"] = disk_enc_kek_url
-                    extension_info["settings"]["KekVaultResourceId"] = disk_enc_keyvault
-                # pylint: disable=unused-variable
-                encryption_info = __salt__[
-                    "azurerm_compute_virtual_machine_extension.create_or_update"
-                ](
-                    name="DiskEncryption",
-                    vm_name=name,
-                    resource_group=resource_group,
-                    location=result["location"],
-                    publisher=extension_info["publisher"],
-                    extension_type=extension_info["type"],
-                    version=extension_info["version"],
-                    settings=extension_info["settings"],
-                    **connection_profile,
-                )
-
-                result["storage_profile"]["disk_encryption"] = True
-            except KeyError as exc:
-                log.error("An error occured while trying to enable disk encryption: %s", (str(exc)))
-                result["storage_profile"]["disk_encryption"] = False
-
-        # Give some more details about the sub-objects
-        network_interfaces = []
-
-        for iface in result["network_profile"]["network_interfaces"]:
-            iface_dict = parse_resource_id(iface["id"])
-
-            iface_details = __salt__["azurerm_network.network_interface_get"](
-                resource_group=iface_dict["resource_group"],
-                name=iface_dict["name"],
-                **kwargs,
+            result["storage_profile"]["disk_encryption"] = _apply_disk_encryption(
+                name,
+                resource_group,
+                result["location"],
+                is_linux,
+                disk_enc_keyvault,
+                disk_enc_volume_type,
+                keyvault_url=prefetched.get("vault_uri"),
+                kek_url=disk_enc_kek_url,
+                **connection_profile,
             )
 
-            network_interfaces.append(iface_details)
-
-        result["network_profile"]["network_interfaces"] = network_interfaces
+        # Give some more details about the sub-objects
+        result["network_profile"]["network_interfaces"] = _get_network_interfaces(
+            result["network_profile"]["network_interfaces"], **kwargs
+        )
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
     except SerializationError as exc:
         result = {"error": f"The object model could not be parsed. ({str(exc)})"}
@@ -772,6 +1134,72 @@ def create_or_update(
     return result
 
 
+def bulk_create_or_update(vm_specs, max_workers=4, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Create or update multiple virtual machines concurrently. Each virtual machine is provisioned (along with any
+    network interface and public IP address it requires) in its own worker thread, so the total run time approaches
+    that of the slowest virtual machine instead of the sum of all of them.
+
+    :param vm_specs: A list of dictionaries, each containing the parameters accepted by ``create_or_update`` for a
+        single virtual machine. The ``name``, ``resource_group``, and ``vm_size`` keys are required. Any keyword
+        arguments passed to this function (such as connection parameters) are used as defaults for every virtual
+        machine.
+
+    :param max_workers: The maximum number of virtual machines to provision at the same time. Defaults to 4.
+
+    The result of ``create_or_update`` for each virtual machine is returned keyed by ``resource_group/name``. The
+    specifications are validated before any virtual machine is provisioned, and an error is returned if one of them
+    is missing a required key or if a virtual machine is specified more than once.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_compute_virtual_machine.bulk_create_or_update
+            '[{"name": "test_vm1", "resource_group": "test_group", "vm_size": "Standard_B1s"},
+              {"name": "test_vm2", "resource_group": "test_group", "vm_size": "Standard_B1s"}]'
+
+    """
+    result = {}
+    vm_params = {}
+
+    for index, vm_spec in enumerate(vm_specs):
+        if not isinstance(vm_spec, dict):
+            return {"error": f"The virtual machine at index {index} is not a dictionary."}
+
+        params = {**kwargs, **vm_spec}
+        missing = [key for key in _BULK_REQUIRED_KEYS if not params.get(key)]
+        if missing:
+            return {
+                "error": f"The virtual machine at index {index} is missing the required "
+                f"parameters: {', '.join(missing)}."
+            }
+
+        vm_key = f"{params['resource_group']}/{params['name']}"
+        if vm_key in vm_params:
+            return {"error": f"The virtual machine {vm_key} is specified more than once."}
+        vm_params[vm_key] = params
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        futures = {
+            vm_key: saltext.azurerm.utils.azurerm.submit_with_context(
+                executor, create_or_update, **params
+            )
+            for vm_key, params in vm_params.items()
+        }
+
+        for vm_key, future in futures.items():
+            try:
+                result[vm_key] = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error("Unable to create or update virtual machine %s: %s", vm_key, exc)
+                result[vm_key] = {"error": str(exc)}
+
+    return result
+
+
 def delete(
     name,
     resource_group,
@@ -789,6 +1217,13 @@ def delete(
 
     :param resource_group: The resource group name assigned to the virtual machine.
 
+    :param cleanup_disks: Delete the managed OS disk of the virtual machine as well. Defaults to False.
+
+    :param cleanup_data_disks: Delete the managed data disks of the virtual machine as well. Defaults to False.
+
+    :param cleanup_interfaces: Delete the network interfaces of the virtual machine, along with their public IP
+        addresses, as well. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -797,52 +1232,70 @@ def delete(
 
     """
     result = False
+    polling_interval = kwargs.pop("polling_interval", _DEFAULT_POLLING_INTERVAL)
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
 
-    # pylint: disable=invalid-name
-    vm = __salt__["azurerm_compute_virtual_machine.get"](
-        resource_group=resource_group, name=name, **kwargs
-    )
+    # the virtual machine details are only needed to find the resources to clean up
+    vm = None  # pylint: disable=invalid-name
+    if cleanup_disks or cleanup_data_disks or cleanup_interfaces:
+        # pylint: disable=invalid-name
+        vm = __salt__["azurerm_compute_virtual_machine.get"](
+            resource_group=resource_group, name=name, **kwargs
+        )
 
     try:
         poller = compconn.virtual_machines.begin_delete(
-            resource_group_name=resource_group, vm_name=name
+            resource_group_name=resource_group,
+            vm_name=name,
+            polling=_polling("delete", polling_interval),
         )
 
-        poller.wait()
+        # the disks and interfaces can only be deleted once they are detached, so the interface details needed to
+        # clean them up are looked up while the virtual machine is being deleted
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            iface_lookup = None
+            if cleanup_interfaces:
+                iface_lookup = saltext.azurerm.utils.azurerm.submit_with_context(
+                    executor,
+                    _get_network_interfaces,
+                    vm["network_profile"]["network_interfaces"],
+                    **kwargs,
+                )
 
-        if cleanup_disks:
-            os_disk = parse_resource_id(
-                vm["storage_profile"]["os_disk"].get("managed_disk", {}).get("id")
-            )
-            # pylint: disable=unused-variable
-            os_disk_ret = __salt__["azurerm_compute_disk.delete"](
-                resource_group=os_disk["resource_group"],
-                name=os_disk["name"],
-                **kwargs,
-            )
+            poller.wait()
+
+            iface_details = iface_lookup.result() if iface_lookup else []
+
+        # the disks and interfaces are independent of each other, so they are all cleaned up concurrently
+        cleanup = []
+
+        if cleanup_disks or cleanup_data_disks:
+            disk_delete = __salt__["azurerm_compute_disk.delete"]
 
-        if cleanup_data_disks:
-            for disk in vm["storage_profile"]["data_disks"]:
-                disk_dict = parse_resource_id(disk.get("managed_disk", {}).get("id"))
-                # pylint: disable=unused-variable
-                data_disk_ret = __salt__["azurerm_compute_disk.delete"](
+            def _cleanup_disk(disk):
+                disk_dict = _parse_resource_id(disk.get("managed_disk", {}).get("id"))
+                disk_delete(
                     resource_group=disk_dict["resource_group"],
                     name=disk_dict["name"],
                     **kwargs,
                 )
 
+            if cleanup_disks:
+                cleanup.append((_cleanup_disk, vm["storage_profile"]["os_disk"]))
+            if cleanup_data_disks:
+                cleanup.extend(
+                    (_cleanup_disk, disk) for disk in vm["storage_profile"]["data_disks"]
+                )
+
         if cleanup_interfaces:
-            for iface in vm["network_profile"]["network_interfaces"]:
-                iface_dict = parse_resource_id(iface["id"])
+            network_interface_delete = __salt__["azurerm_network.network_interface_delete"]
+            public_ip_address_delete = __salt__["azurerm_network.public_ip_address_delete"]
 
-                iface_details = __salt__["azurerm_network.network_interface_get"](
-                    resource_group=iface_dict["resource_group"],
-                    name=iface_dict["name"],
-                    **kwargs,
-                )
-                # pylint: disable=unused-variable
-                iface_ret = __salt__["azurerm_network.network_interface_delete"](
+            def _cleanup_interface(iface_and_details):
+                iface, iface_details = iface_and_details
+                iface_dict = _parse_resource_id(iface["id"])
+
+                network_interface_delete(
                     resource_group=iface_dict["resource_group"],
                     name=iface_dict["name"],
                     **kwargs,
@@ -850,19 +1303,31 @@ def delete(
 
                 for ipc in iface_details["ip_configurations"]:
                     if ipc.get("public_ip_address"):
-                        ip_dict = parse_resource_id(ipc["public_ip_address"]["id"])
-
-                        # pylint: disable=unused-variable
-                        ip_ret = __salt__["azurerm.network.public_ip_address.delete"](
+                        ip_dict = _parse_resource_id(ipc["public_ip_address"]["id"])
+                        public_ip_address_delete(
                             resource_group=ip_dict["resource_group"],
                             name=ip_dict["name"],
                             **kwargs,
                         )
 
+            cleanup.extend(
+                (_cleanup_interface, iface_and_details)
+                for iface_and_details in zip(
+                    vm["network_profile"]["network_interfaces"], iface_details
+                )
+            )
+
+        if cleanup:
+            with ThreadPoolExecutor(max_workers=min(16, len(cleanup))) as executor:
+                futures = [executor.submit(func, item) for func, item in cleanup]
+                # surface any errors raised during the cleanup
+                for future in futures:
+                    future.result()
+
         result = True
 
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
 
     return result
 
@@ -898,19 +1363,16 @@ def capture(
         salt-call azurerm_compute_virtual_machine.capture testvm testcontainer testgroup
 
     """
-    # pylint: disable=invalid-name
-    VirtualMachineCaptureParameters = getattr(
-        azure.mgmt.compute.models, "VirtualMachineCaptureParameters"
-    )
-
     result = {}
+    polling_interval = kwargs.pop("polling_interval", _DEFAULT_POLLING_INTERVAL)
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
     try:
         # pylint: disable=invalid-name
         vm = compconn.virtual_machines.begin_capture(
             resource_group_name=resource_group,
             vm_name=name,
-            parameters=VirtualMachineCaptureParameters(
+            polling=_polling("capture", polling_interval),
+            parameters=_compute_model("VirtualMachineCaptureParameters")(
                 vhd_prefix=prefix,
                 destination_container_name=destination_name,
                 overwrite_vhds=overwrite,
@@ -920,7 +1382,7 @@ def capture(
         vm_result = vm.result()
         result = vm_result.as_dict()
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -954,7 +1416,7 @@ def get(name, resource_group, **kwargs):
         )
         result = vm.as_dict()
     except (HttpResponseError, ResourceNotFoundError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -977,22 +1439,7 @@ def assess_patches(name, resource_group, **kwargs):
         salt-call azurerm_compute_virtual_machine.assess_patches testvm testgroup
 
     """
-    result = {}
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_assess_patches(
-            resource_group_name=resource_group, vm_name=name
-        )
-
-        vm.wait()
-        result = vm.result().as_dict()
-    except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action("assess_patches", name, resource_group, return_result=True, **kwargs)
 
 
 def convert_to_managed_disks(name, resource_group, **kwargs):
@@ -1013,20 +1460,7 @@ def convert_to_managed_disks(name, resource_group, **kwargs):
         salt-call azurerm_compute_virtual_machine.convert_to_managed_disks testvm testgroup
 
     """
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_convert_to_managed_disks(
-            resource_group_name=resource_group, vm_name=name
-        )
-        vm.wait()
-        vm_result = vm.result()
-        result = vm_result.as_dict()
-    except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action("convert_to_managed_disks", name, resource_group, **kwargs)
 
 
 def deallocate(name, resource_group, **kwargs):
@@ -1046,21 +1480,7 @@ def deallocate(name, resource_group, **kwargs):
         salt-call azurerm_compute_virtual_machine.deallocate testvm testgroup
 
     """
-    result = False
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_deallocate(
-            resource_group_name=resource_group, vm_name=name
-        )
-        vm.wait()
-        result = True
-    except (HttpResponseError, ResourceNotFoundError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action("deallocate", name, resource_group, **kwargs)
 
 
 def generalize(name, resource_group, **kwargs):
@@ -1086,7 +1506,7 @@ def generalize(name, resource_group, **kwargs):
         compconn.virtual_machines.generalize(resource_group_name=resource_group, vm_name=name)
         result = True
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
 
     return result
 
@@ -1111,18 +1531,18 @@ def list_(resource_group=None, **kwargs):
 
     try:
         if resource_group:
-            vms = saltext.azurerm.utils.azurerm.paged_object_to_list(
-                compconn.virtual_machines.list(resource_group_name=resource_group)
+            vms = compconn.virtual_machines.list(
+                resource_group_name=resource_group,
+                **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
             )
         else:
-            vms = saltext.azurerm.utils.azurerm.paged_object_to_list(
-                compconn.virtual_machines.list_all(**kwargs)
+            vms = compconn.virtual_machines.list_all(
+                **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs)
             )
 
-        for vm in vms:  # pylint: disable=invalid-name
-            result[vm["name"]] = vm
+        result = {vm["name"]: vm for vm in saltext.azurerm.utils.azurerm.iter_paged_object(vms)}
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -1144,13 +1564,14 @@ def virtual_machines_list_all(**kwargs):
     result = {}
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
     try:
-        vms = saltext.azurerm.utils.azurerm.paged_object_to_list(
-            compconn.virtual_machines.list_all()
-        )
-        for vm in vms:  # pylint: disable=invalid-name
-            result[vm["name"]] = vm
+        result = {
+            vm["name"]: vm
+            for vm in saltext.azurerm.utils.azurerm.iter_paged_object(
+                compconn.virtual_machines.list_all()
+            )
+        }
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -1175,14 +1596,14 @@ def list_by_location(location, **kwargs):
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
 
     try:
-        vms = saltext.azurerm.utils.azurerm.paged_object_to_list(
-            compconn.virtual_machines.list_by_location(location=location)
-        )
-
-        for vm in vms:  # pylint: disable=invalid-name
-            result[vm["name"]] = vm
+        result = {
+            vm["name"]: vm
+            for vm in saltext.azurerm.utils.azurerm.iter_paged_object(
+                compconn.virtual_machines.list_by_location(location=location)
+            )
+        }
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -1209,15 +1630,16 @@ def list_available_sizes(name, resource_group, **kwargs):
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
 
     try:
-        sizes = saltext.azurerm.utils.azurerm.paged_object_to_list(
-            compconn.virtual_machines.list_available_sizes(
-                resource_group_name=resource_group, vm_name=name
+        result = {
+            size["name"]: size
+            for size in saltext.azurerm.utils.azurerm.iter_paged_object(
+                compconn.virtual_machines.list_available_sizes(
+                    resource_group_name=resource_group, vm_name=name
+                )
             )
-        )
-        for size in sizes:
-            result[size["name"]] = size
+        }
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -1251,7 +1673,7 @@ def instance_view(name, resource_group, **kwargs):
 
         result = vm.as_dict()
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -1274,21 +1696,7 @@ def perform_maintenance(name, resource_group, **kwargs):
         salt-call azurerm_compute_virtual_machine.perform_maintenance testvm testgroup
 
     """
-    result = {}
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_perform_maintenance(
-            resource_group_name=resource_group, vm_name=name
-        )
-
-        result = vm.as_dict()
-    except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action("perform_maintenance", name, resource_group, **kwargs)
 
 
 def power_off(name, resource_group, **kwargs):
@@ -1309,20 +1717,7 @@ def power_off(name, resource_group, **kwargs):
         salt-call azurerm_compute_virtual_machine.power_off testvm testgroup
 
     """
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_power_off(
-            resource_group_name=resource_group, vm_name=name
-        )
-        vm.wait()
-        vm_result = vm.result()
-        result = vm_result.as_dict()
-    except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action("power_off", name, resource_group, **kwargs)
 
 
 def reapply(name, resource_group, **kwargs):
@@ -1342,21 +1737,7 @@ def reapply(name, resource_group, **kwargs):
         salt-call azurerm_compute_virtual_machine.reapply testvm testgroup
 
     """
-    result = False
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_reapply(
-            resource_group_name=resource_group, vm_name=name
-        )
-        vm.wait()
-        result = True
-    except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action("reapply", name, resource_group, **kwargs)
 
 
 def reimage(name, resource_group, temp_disk=False, **kwargs):
@@ -1379,21 +1760,9 @@ def reimage(name, resource_group, temp_disk=False, **kwargs):
         salt-call azurerm_compute_virtual_machine.reimage testvm testgroup
 
     """
-    result = False
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_reimage(
-            resource_group_name=resource_group, vm_name=name, temp_disk=temp_disk
-        )
-        vm.wait()
-        result = True
-    except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action(
+        "reimage", name, resource_group, operation_kwargs={"temp_disk": temp_disk}, **kwargs
+    )
 
 
 def restart(name, resource_group, **kwargs):
@@ -1413,23 +1782,7 @@ def restart(name, resource_group, **kwargs):
         salt-call azurerm_compute_virtual_machine.restart testvm testgroup
 
     """
-    result = {}
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_restart(
-            resource_group_name=resource_group, vm_name=name
-        )
-
-        vm.wait()
-        vm_result = vm.result()
-        result = vm_result.as_dict()
-    except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action("restart", name, resource_group, **kwargs)
 
 
 def start(name, resource_group, **kwargs):
@@ -1449,20 +1802,7 @@ def start(name, resource_group, **kwargs):
         salt-call azurerm_compute_virtual_machine.start testvm testgroup
 
     """
-    result = False
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_start(resource_group_name=resource_group, vm_name=name)
-
-        vm.wait()
-        result = True
-    except (HttpResponseError, ResourceNotFoundError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action("start", name, resource_group, **kwargs)
 
 
 def redeploy(name, resource_group, **kwargs):
@@ -1482,21 +1822,7 @@ def redeploy(name, resource_group, **kwargs):
         salt-call azurerm_compute_virtual_machine.redeploy testvm testgroup
 
     """
-    result = {}
-    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
-    try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.begin_redeploy(
-            resource_group_name=resource_group, vm_name=name
-        )
-        vm.wait()
-        vm_result = vm.result()
-        result = vm_result.as_dict()
-    except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
-        result = {"error": str(exc)}
-
-    return result
+    return _vm_action("redeploy", name, resource_group, **kwargs)
 
 
 def retrieve_boot_diagnostics_data(name, resource_group, sas_uri_expiration_time=None, **kwargs):
@@ -1529,10 +1855,9 @@ def retrieve_boot_diagnostics_data(name, resource_group, sas_uri_expiration_time
             vm_name=name,
             sas_uri_expiration_time_in_minutes=sas_uri_expiration_time,
         )
-        vm.wait()
-        result = vm.result().as_dict()
+        result = vm.as_dict()
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -1560,15 +1885,126 @@ def simulate_eviction(name, resource_group, **kwargs):
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
 
     try:
-        # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.simulate_eviction(
+        compconn.virtual_machines.simulate_eviction(
             resource_group_name=resource_group,
             vm_name=name,
         )
-        vm.wait()
         result = True
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
+
+
+def _bulk_action(action, names, resource_group, max_workers=16, **kwargs):
+    """
+    Run a single virtual machine action against several virtual machines in the same resource group concurrently,
+    returning the result of each action keyed by virtual machine name.
+    """
+    result = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(int(max_workers), len(names)))) as executor:
+        futures = {
+            name: saltext.azurerm.utils.azurerm.submit_with_context(
+                executor, action, name=name, resource_group=resource_group, **kwargs
+            )
+            for name in names
+        }
+
+        for name, future in futures.items():
+            try:
+                result[name] = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error("Unable to %s virtual machine %s: %s", action.__name__, name, exc)
+                result[name] = {"error": str(exc)}
+
+    return result
+
+
+def bulk_start(names, resource_group, max_workers=16, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Power on (start) multiple virtual machines concurrently.
+
+    :param names: A list of the names of the virtual machines to start.
+
+    :param resource_group: The resource group name assigned to the virtual machines.
+
+    :param max_workers: The maximum number of virtual machines to start at the same time. Defaults to 16.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_compute_virtual_machine.bulk_start '["testvm1", "testvm2"]' testgroup
+
+    """
+    return _bulk_action(start, names, resource_group, max_workers=max_workers, **kwargs)
+
+
+def bulk_power_off(names, resource_group, max_workers=16, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Power off (stop) multiple virtual machines concurrently.
+
+    :param names: A list of the names of the virtual machines to stop.
+
+    :param resource_group: The resource group name assigned to the virtual machines.
+
+    :param max_workers: The maximum number of virtual machines to stop at the same time. Defaults to 16.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_compute_virtual_machine.bulk_power_off '["testvm1", "testvm2"]' testgroup
+
+    """
+    return _bulk_action(power_off, names, resource_group, max_workers=max_workers, **kwargs)
+
+
+def bulk_restart(names, resource_group, max_workers=16, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Restart multiple virtual machines concurrently.
+
+    :param names: A list of the names of the virtual machines to restart.
+
+    :param resource_group: The resource group name assigned to the virtual machines.
+
+    :param max_workers: The maximum number of virtual machines to restart at the same time. Defaults to 16.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_compute_virtual_machine.bulk_restart '["testvm1", "testvm2"]' testgroup
+
+    """
+    return _bulk_action(restart, names, resource_group, max_workers=max_workers, **kwargs)
+
+
+def bulk_deallocate(names, resource_group, max_workers=16, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Power off multiple virtual machines concurrently and release their compute resources.
+
+    :param names: A list of the names of the virtual machines to deallocate.
+
+    :param resource_group: The resource group name assigned to the virtual machines.
+
+    :param max_workers: The maximum number of virtual machines to deallocate at the same time. Defaults to 16.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_compute_virtual_machine.bulk_deallocate '["testvm1", "testvm2"]' testgroup
+
+    """
+    return _bulk_action(deallocate, names, resource_group, max_workers=max_workers, **kwargs)
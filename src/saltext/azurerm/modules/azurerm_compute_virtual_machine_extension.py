@@ -35,14 +35,16 @@ Azure Resource Manager (ARM) Compute Virtual Machine Extension Operations Execut
 """
 
 # Python libs
+import functools
 import logging
+import time
 
 import saltext.azurerm.utils.azurerm
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.compute.models  # pylint: disable=unused-import
+    import azure.mgmt.compute  # pylint: disable=unused-import
     from azure.core.exceptions import HttpResponseError
 
     HAS_LIBS = True
@@ -103,12 +105,98 @@ def create_or_update(
 
     """
     result = {}
+    poller = _begin_create_or_update(
+        name,
+        vm_name,
+        resource_group,
+        location,
+        publisher,
+        extension_type,
+        version,
+        settings,
+        auto_upgrade_minor_version=auto_upgrade_minor_version,
+        **kwargs,
+    )
+    if isinstance(poller, dict):
+        return poller
+
+    try:
+        poller.wait()
+        result = poller.result().as_dict()
+    except HttpResponseError as exc:
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
+        result = {"error": str(exc)}
+
+    return result
+
+
+@functools.lru_cache(maxsize=None)
+def _extension_model_attributes(models):
+    """
+    Look up the VirtualMachineExtension model of a models module once, along with the names of its attributes which
+    can be passed to it as they are and of those which hold nested models. Returns None if the models module does not
+    expose the model.
+    """
+    # pylint: disable=invalid-name
+    Model = getattr(models, "VirtualMachineExtension", None)
+    if Model is None:
+        return None
+
+    flat, nested = set(), set()
+    for attr, items in Model._attribute_map.items():  # pylint: disable=protected-access
+        if items["type"][0].isupper() or items["type"][0] == "[":
+            nested.add(attr)
+        else:
+            flat.add(attr)
+
+    return Model, frozenset(flat), frozenset(nested)
+
+
+def _extension_model(compconn, **kwargs):
+    """
+    Build a VirtualMachineExtension model from the models of the API version used for the extension operations. The
+    model is constructed directly unless nested models need to be assembled, which is left to
+    ``create_object_model``.
+    """
+    attributes = _extension_model_attributes(
+        compconn.models(
+            saltext.azurerm.utils.azurerm.get_api_version(compconn, "virtual_machine_extensions")
+        )
+    )
+    if attributes is None or any(kwargs.get(attr) is not None for attr in attributes[2]):
+        return saltext.azurerm.utils.azurerm.create_object_model(
+            "compute", "VirtualMachineExtension", **kwargs
+        )
+
+    Model, flat, _ = attributes  # pylint: disable=invalid-name
+    return Model(**{attr: kwargs[attr] for attr in flat if kwargs.get(attr) is not None})
+
+
+def _begin_create_or_update(
+    name,
+    vm_name,
+    resource_group,
+    location,
+    publisher,
+    extension_type,
+    version,
+    settings,
+    auto_upgrade_minor_version=None,
+    **kwargs,
+):
+    """
+    Start the operation to create or update the extension without waiting for it to finish. This accepts the same
+    parameters as ``create_or_update``, and returns the poller of the long-running operation, or a dictionary
+    containing an ``error`` key if the operation could not be started.
+    """
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+    extension_ops = saltext.azurerm.utils.azurerm.get_operation_group(
+        compconn, "virtual_machine_extensions"
+    )
 
     try:
-        paramsmodel = saltext.azurerm.utils.azurerm.create_object_model(
-            "compute",
-            "VirtualMachineExtension",
+        paramsmodel = _extension_model(
+            compconn,
             location=location,
             settings=settings,
             publisher=publisher,
@@ -122,17 +210,14 @@ def create_or_update(
         return result
 
     try:
-        extension = compconn.virtual_machine_extensions.begin_create_or_update(
+        result = extension_ops.begin_create_or_update(
             vm_extension_name=name,
             vm_name=vm_name,
             resource_group_name=resource_group,
             extension_parameters=paramsmodel,
         )
-
-        extension.wait()
-        result = extension.result().as_dict()
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -158,22 +243,106 @@ def delete(name, vm_name, resource_group, **kwargs):
 
     """
     result = False
+    poller = _begin_delete(name, vm_name, resource_group, **kwargs)
+    if isinstance(poller, dict):
+        return poller
+
+    try:
+        poller.wait()
+        result = True
+    except HttpResponseError as exc:
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
+        result = {"error": str(exc)}
+
+    return result
+
+
+def _begin_delete(name, vm_name, resource_group, **kwargs):
+    """
+    Start the operation to delete the extension without waiting for it to finish. This accepts the same parameters as
+    ``delete``, and returns the poller of the long-running operation, or a dictionary containing an ``error`` key if
+    the operation could not be started.
+    """
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+    extension_ops = saltext.azurerm.utils.azurerm.get_operation_group(
+        compconn, "virtual_machine_extensions"
+    )
 
     try:
-        extension = compconn.virtual_machine_extensions.begin_delete(
+        result = extension_ops.begin_delete(
             vm_extension_name=name, vm_name=vm_name, resource_group_name=resource_group
         )
-
-        extension.wait()
-        result = True
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
         result = {"error": str(exc)}
 
     return result
 
 
+def _wait_all(pollers, timeout=None):
+    """
+    Wait for several long-running extension operations started with ``_begin_create_or_update`` or ``_begin_delete``
+    to finish, for at most ``timeout`` seconds in total. The operations are polled in the background concurrently, so
+    this takes as long as the slowest of them. Returns the outcome of each operation in the same order as the pollers.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    results = []
+
+    for poller in pollers:
+        if isinstance(poller, dict):
+            results.append(poller)
+            continue
+
+        try:
+            poller.wait(None if deadline is None else max(0, deadline - time.monotonic()))
+            if poller.done():
+                result = poller.result()
+                results.append(True if result is None else result.as_dict())
+            else:
+                results.append(None)
+        except HttpResponseError as exc:
+            log.error("An extension operation has failed: %s", exc)
+            results.append({"error": str(exc)})
+
+    return results
+
+
+def create_or_update_many(extensions, timeout=None, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Create or update several extensions at once. All of the operations are started before waiting for any of them,
+    so that they run concurrently and the call takes about as long as the slowest of them.
+
+    :param extensions: A list of dictionaries, each containing the parameters of ``create_or_update`` for one
+        extension: ``name``, ``vm_name``, ``resource_group``, ``location``, ``publisher``, ``extension_type``,
+        ``version``, ``settings``, and optionally ``auto_upgrade_minor_version`` and ``tags``.
+
+    :param timeout: The maximum number of seconds to wait for all of the operations. By default, there is no limit.
+
+    A list with the outcome of each operation is returned in the same order as the extensions: the extension as a
+    dictionary for finished operations, a dictionary containing an ``error`` key for failed operations, and None for
+    operations which had not finished within the timeout.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_compute_virtual_machine_extension.create_or_update_many '[{"name": "test_name",
+        "vm_name": "test_vm", "resource_group": "test_group", "location": "test_loc", "publisher": "test_publisher",
+        "extension_type": "test_type", "version": "test_version", "settings": {}}]'
+
+    """
+    pollers = []
+    for extension in extensions:
+        try:
+            pollers.append(_begin_create_or_update(**{**kwargs, **extension}))
+        except TypeError as exc:
+            pollers.append({"error": f"The extension parameters are invalid. ({str(exc)})"})
+
+    return _wait_all(pollers, timeout=timeout)
+
+
 def get(name, vm_name, resource_group, **kwargs):
     """
     .. versionadded:: 2.1.0
@@ -195,15 +364,18 @@ def get(name, vm_name, resource_group, **kwargs):
     """
     result = {}
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+    extension_ops = saltext.azurerm.utils.azurerm.get_operation_group(
+        compconn, "virtual_machine_extensions"
+    )
 
     try:
-        extension = compconn.virtual_machine_extensions.get(
+        extension = extension_ops.get(
             vm_extension_name=name, vm_name=vm_name, resource_group_name=resource_group
         )
 
         result = extension.as_dict()
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -228,17 +400,16 @@ def list_(vm_name, resource_group, **kwargs):
     """
     result = {}
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+    extension_ops = saltext.azurerm.utils.azurerm.get_operation_group(
+        compconn, "virtual_machine_extensions"
+    )
 
     try:
-        extensions = compconn.virtual_machine_extensions.list(
-            vm_name=vm_name, resource_group_name=resource_group
-        )
+        extensions = extension_ops.list(vm_name=vm_name, resource_group_name=resource_group)
 
-        extensions_as_list = extensions.as_dict().get("value", {})
-        for extension in extensions_as_list:
-            result[extension["name"]] = extension
+        result = {extension.name: extension.as_dict() for extension in extensions.value or []}
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
         result = {"error": str(exc)}
 
     return result
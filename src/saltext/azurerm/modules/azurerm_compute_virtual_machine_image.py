@@ -35,14 +35,18 @@ Azure Resource Manager (ARM) Compute Virtual Machine Image Execution Module
 """
 
 # Python libs
+import functools
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 
 import saltext.azurerm.utils.azurerm
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.compute.models  # pylint: disable=unused-import
+    import azure.mgmt.compute  # pylint: disable=unused-import
     from azure.core.exceptions import HttpResponseError
 
     HAS_LIBS = True
@@ -53,7 +57,11 @@ __func_alias__ = {"list_": "list"}
 
 log = logging.getLogger(__name__)
 
+# Image metadata rarely changes, so lookups are cached for an hour.
+_IMAGE_CACHE_TTL = 3600
 
+
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_IMAGE_CACHE_TTL)
 def get(location, publisher, offer, sku, version, **kwargs):
     """
     .. versionadded:: 2.1.0
@@ -79,9 +87,12 @@ def get(location, publisher, offer, sku, version, **kwargs):
     """
     result = {}
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+    image_ops = saltext.azurerm.utils.azurerm.get_operation_group(
+        compconn, "virtual_machine_images"
+    )
 
     try:
-        image = compconn.virtual_machine_images.get(
+        image = image_ops.get(
             location=location,
             publisher_name=publisher,
             offer=offer,
@@ -91,12 +102,13 @@ def get(location, publisher, offer, sku, version, **kwargs):
 
         result = image.as_dict()
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
         result = {"error": str(exc)}
 
     return result
 
 
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_IMAGE_CACHE_TTL)
 def list_(location, publisher, offer, sku, **kwargs):
     """
     .. versionadded:: 2.1.0
@@ -120,26 +132,28 @@ def list_(location, publisher, offer, sku, **kwargs):
     """
     result = {}
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+    image_ops = saltext.azurerm.utils.azurerm.get_operation_group(
+        compconn, "virtual_machine_images"
+    )
 
     try:
-        images = compconn.virtual_machine_images.list(
+        images = image_ops.list(
             location=location,
             skus=sku,
             publisher_name=publisher,
             offer=offer,
-            **kwargs,
+            **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
         )
 
-        for image in images:
-            img = image.as_dict()
-            result[img["name"]] = img
+        result = {image.name: image.as_dict() for image in images}
     except (HttpResponseError, AttributeError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
         result = {"error": str(exc)}
 
     return result
 
 
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_IMAGE_CACHE_TTL)
 def list_offers(location, publisher, **kwargs):
     """
     .. versionadded:: 2.1.0
@@ -159,22 +173,26 @@ def list_offers(location, publisher, **kwargs):
     """
     result = {}
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+    image_ops = saltext.azurerm.utils.azurerm.get_operation_group(
+        compconn, "virtual_machine_images"
+    )
 
     try:
-        images = compconn.virtual_machine_images.list_offers(
-            location=location, publisher_name=publisher, **kwargs
+        images = image_ops.list_offers(
+            location=location,
+            publisher_name=publisher,
+            **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
         )
 
-        for image in images:
-            img = image.as_dict()
-            result[img["name"]] = img
+        result = {image.name: image.as_dict() for image in images}
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
         result = {"error": str(exc)}
 
     return result
 
 
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_IMAGE_CACHE_TTL)
 def list_publishers(location, **kwargs):
     """
     .. versionadded:: 2.1.0
@@ -192,20 +210,24 @@ def list_publishers(location, **kwargs):
     """
     result = {}
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+    image_ops = saltext.azurerm.utils.azurerm.get_operation_group(
+        compconn, "virtual_machine_images"
+    )
 
     try:
-        images = compconn.virtual_machine_images.list_publishers(location=location, **kwargs)
+        images = image_ops.list_publishers(
+            location=location, **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs)
+        )
 
-        for image in images:
-            img = image.as_dict()
-            result[img["name"]] = img
+        result = {image.name: image.as_dict() for image in images}
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
         result = {"error": str(exc)}
 
     return result
 
 
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_IMAGE_CACHE_TTL)
 def list_skus(location, publisher, offer, **kwargs):
     """
     .. versionadded:: 2.1.0
@@ -227,17 +249,212 @@ def list_skus(location, publisher, offer, **kwargs):
     """
     result = {}
     compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+    image_ops = saltext.azurerm.utils.azurerm.get_operation_group(
+        compconn, "virtual_machine_images"
+    )
 
     try:
-        images = compconn.virtual_machine_images.list_skus(
-            location=location, publisher_name=publisher, offer=offer, **kwargs
+        images = image_ops.list_skus(
+            location=location,
+            publisher_name=publisher,
+            offer=offer,
+            **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
         )
 
-        for image in images:
-            img = image.as_dict()
-            result[img["name"]] = img
+        result = {image.name: image.as_dict() for image in images}
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("compute", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
         result = {"error": str(exc)}
 
     return result
+
+
+def _is_error(ret):
+    """
+    Check whether the return of one of the listing functions is an error.
+    """
+    return isinstance(ret.get("error"), str)
+
+
+def _call_concurrently(executor, func, calls, **kwargs):
+    """
+    Call a function concurrently with each of a list of argument tuples, returning the results keyed by the
+    argument tuples. The keyword arguments are bound to the function once for all of the calls.
+    """
+    bound = functools.partial(func, **kwargs)
+    futures = {
+        args: saltext.azurerm.utils.azurerm.submit_with_context(executor, bound, *args)
+        for args in calls
+    }
+    return {args: future.result() for args, future in futures.items()}
+
+
+def list_all(location, publisher=None, offer=None, max_workers=16, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Gets the catalog of virtual machine images for the specified location as a nested dictionary of publishers,
+    offers, SKUs, and image versions. The offers of all publishers, the SKUs of all offers, and the versions of all
+    SKUs are each looked up concurrently. Since the complete catalog of a location is very large, it can be limited
+    to a single publisher, or to a single offer of that publisher.
+
+    :param location: The name of a supported Azure region.
+
+    :param publisher: A valid image publisher, which limits the catalog to the offers of that publisher.
+
+    :param offer: A valid image publisher offer, which limits the catalog to the SKUs of that offer. This requires the
+        ``publisher`` parameter.
+
+    :param max_workers: The maximum number of concurrent requests. Defaults to 16.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_compute_virtual_machine_image.list_all "eastus" publisher=test_publisher
+
+    """
+    if offer and not publisher:
+        return {"error": "The offer parameter requires the publisher parameter."}
+
+    # the location and publisher are repeated in the arguments and cache keys of every call of the fan-out
+    location = sys.intern(location)
+
+    if publisher:
+        publisher = sys.intern(publisher)
+        publishers = [publisher]
+    else:
+        publishers = list_publishers(location, **kwargs)
+        if _is_error(publishers):
+            return publishers
+
+    result = {}
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        if offer:
+            result[publisher] = {offer: {}}
+        else:
+            offers = _call_concurrently(
+                executor, list_offers, [(location, pub) for pub in publishers], **kwargs
+            )
+            for (_, pub), pub_offers in offers.items():
+                result[pub] = pub_offers if _is_error(pub_offers) else dict.fromkeys(pub_offers)
+
+        skus = _call_concurrently(
+            executor,
+            list_skus,
+            [
+                (location, pub, off)
+                for pub, pub_offers in result.items()
+                if not _is_error(pub_offers)
+                for off in pub_offers
+            ],
+            **kwargs,
+        )
+        for (_, pub, off), offer_skus in skus.items():
+            result[pub][off] = offer_skus if _is_error(offer_skus) else dict.fromkeys(offer_skus)
+
+        versions = _call_concurrently(
+            executor,
+            list_,
+            [
+                (location, pub, off, sku)
+                for pub, pub_offers in result.items()
+                if not _is_error(pub_offers)
+                for off, offer_skus in pub_offers.items()
+                if not _is_error(offer_skus)
+                for sku in offer_skus
+            ],
+            **kwargs,
+        )
+        for (_, pub, off, sku), sku_versions in versions.items():
+            result[pub][off][sku] = sku_versions
+
+    return result
+
+
+def list_batch(location, publisher, offers, skus=None, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Gets the SKUs of several offers of a publisher, or the image versions of several SKUs, for the specified location.
+    The listings are retrieved through the batch endpoint of Azure Resource Manager, which combines up to 20 of them
+    into a single request.
+
+    :param location: The name of a supported Azure region.
+
+    :param publisher: A valid image publisher.
+
+    :param offers: A list of valid image publisher offers.
+
+    :param skus: A list of valid image SKUs. If specified, the image versions of each of these SKUs within each of the
+        offers are listed, instead of the SKUs of the offers.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_compute_virtual_machine_image.list_batch "eastus" test_publisher '["test_offer"]'
+
+    """
+    result = {}
+    compconn = saltext.azurerm.utils.azurerm.get_client("compute", **kwargs)
+
+    api_version = saltext.azurerm.utils.azurerm.get_api_version(compconn, "virtual_machine_images")
+    # pylint: disable=protected-access
+    image_resource = compconn.models(api_version).VirtualMachineImageResource
+    offers_url = (
+        f"/subscriptions/{compconn._config.subscription_id}/providers/Microsoft.Compute"
+        f"/locations/{quote(location)}/publishers/{quote(publisher)}/artifacttypes/vmimage/offers"
+    )
+
+    if skus:
+        keys = [(offer, sku) for offer in offers for sku in skus]
+        urls = [
+            f"{offers_url}/{quote(offer)}/skus/{quote(sku)}/versions?api-version={api_version}"
+            for offer, sku in keys
+        ]
+    else:
+        keys = [(offer,) for offer in offers]
+        urls = [f"{offers_url}/{quote(offer)}/skus?api-version={api_version}" for offer, in keys]
+
+    try:
+        responses = saltext.azurerm.utils.azurerm.batch_get(urls, **kwargs)
+    except HttpResponseError as exc:
+        saltext.azurerm.utils.azurerm.log_cloud_error("compute", exc, **kwargs)
+        return {"error": str(exc)}
+
+    for key, response in zip(keys, responses):
+        if isinstance(response, dict) and "error" in response:
+            listing = response
+        else:
+            listing = {}
+            for item in response or []:
+                img = image_resource.deserialize(item).as_dict()
+                listing[img["name"]] = img
+
+        node = result
+        for name in key[:-1]:
+            node = node.setdefault(name, {})
+        node[key[-1]] = listing
+
+    return result
+
+
+def clear_image_cache():
+    """
+    .. versionadded:: 4.2.0
+
+    Clear the cached virtual machine image metadata. The results of ``get``, ``list``,
+    ``list_offers``, ``list_publishers``, and ``list_skus`` are cached for an hour.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_compute_virtual_machine_image.clear_image_cache
+
+    """
+    for func in (get, list_, list_offers, list_publishers, list_skus):
+        func.cache_clear()
+
+    return True
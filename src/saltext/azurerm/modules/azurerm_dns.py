@@ -36,23 +36,27 @@ Optional provider parameters:
         * ``AZURE_US_GOV_CLOUD``
         * ``AZURE_GERMAN_CLOUD``
 
+Requests which are throttled or fail with a server error are retried with an exponential backoff, honoring any
+Retry-After header sent by Azure. The ``retry_total`` and ``timeout`` keyword arguments override the number of
+retries and the timeout (in seconds) of the requests made by a single call.
+
 """
 
 # Python libs
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import saltext.azurerm.utils.azurerm
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.dns.models  # pylint: disable=unused-import
-    import azure.mgmt.privatedns.models  # pylint: disable=unused-import
     from azure.core.exceptions import HttpResponseError
     from azure.core.exceptions import ResourceNotFoundError
     from azure.core.exceptions import SerializationError
 
-    HAS_LIBS = True
+    # The management packages are only looked for here. Their models are imported once a zone or record set is built.
+    HAS_LIBS = saltext.azurerm.utils.azurerm.has_modules("azure.mgmt.dns", "azure.mgmt.privatedns")
 except ImportError:
     pass
 
@@ -60,6 +64,32 @@ __virtualname__ = "azurerm_dns"
 
 log = logging.getLogger(__name__)
 
+# The client type, the keyword argument naming the zone in the operations, the operation group and model of the
+# zones, and the operation listing all of the record sets of a zone, for each type of DNS zone
+_ZONE_TYPES = {
+    "public": {
+        "client": "dns",
+        "zone_name": "zone_name",
+        "zones": "zones",
+        "zone_model": "Zone",
+        "list_record_sets": "list_by_dns_zone",
+    },
+    "private": {
+        "client": "privatedns",
+        "zone_name": "private_zone_name",
+        "zones": "private_zones",
+        "zone_model": "PrivateZone",
+        "list_record_sets": "list",
+    },
+}
+
+# States look up the same zones and record sets repeatedly within a run, so lookups are cached briefly. The cache
+# is cleared whenever a zone or record set is written.
+_GET_CACHE_TTL = 30
+
+# The number of seconds to wait for a long-running zone operation before giving up on it
+_OPERATION_TIMEOUT = 600
+
 
 def __virtual__():
     if not HAS_LIBS:
@@ -73,6 +103,42 @@ def __virtual__():
     return __virtualname__
 
 
+def _zone_type(zone_type):
+    """
+    Look up the details of a type of DNS zone, ignoring case. None is returned for unknown types of zones.
+    """
+    return _ZONE_TYPES.get(str(zone_type).lower())
+
+
+def _invalid_zone_type(zone_type):
+    """
+    Log and return the error for an unknown type of DNS zone.
+    """
+    errmsg = (
+        f"The zone type {zone_type} is not valid. Possible values include: 'Public', 'Private'."
+    )
+    log.error(errmsg)
+    return {"error": errmsg}
+
+
+def _vnet_references(vnets):
+    """
+    Convert a list of virtual network ID strings to a list of dictionaries with an id key. Virtual networks which are
+    already passed as dictionaries are kept as they are.
+    """
+    if all(isinstance(vnet, dict) for vnet in vnets):
+        return vnets
+    return [vnet if isinstance(vnet, dict) else {"id": vnet} for vnet in vnets]
+
+
+def _clear_get_cache():
+    """
+    Forget the cached zones and record sets after a write, so that they are looked up again.
+    """
+    record_set_get.cache_clear()
+    zone_get.cache_clear()
+
+
 def record_set_create_or_update(
     name, zone_name, resource_group, record_type, zone_type="Public", **kwargs
 ):
@@ -103,11 +169,12 @@ def record_set_create_or_update(
 
     """
 
-    client = "dns"
-    if zone_type.lower() == "private":
-        client = "privatedns"
+    zone = _zone_type(zone_type)
+    if zone is None:
+        return _invalid_zone_type(zone_type)
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    record_set_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, "record_sets")
 
     try:
         record_set_model = saltext.azurerm.utils.azurerm.create_object_model(
@@ -118,36 +185,93 @@ def record_set_create_or_update(
         return result
 
     try:
-        if zone_type.lower() == "private":
-            record_set = dnsconn.record_sets.create_or_update(
-                relative_record_set_name=name,
-                private_zone_name=zone_name,
-                resource_group_name=resource_group,
-                record_type=record_type,
-                parameters=record_set_model,
-                if_match=kwargs.get("if_match"),
-                if_none_match=kwargs.get("if_none_match"),
-            )
-        else:
-            record_set = dnsconn.record_sets.create_or_update(
-                relative_record_set_name=name,
-                zone_name=zone_name,
-                resource_group_name=resource_group,
-                record_type=record_type,
-                parameters=record_set_model,
-                if_match=kwargs.get("if_match"),
-                if_none_match=kwargs.get("if_none_match"),
-            )
+        record_set = record_set_ops.create_or_update(
+            relative_record_set_name=name,
+            resource_group_name=resource_group,
+            record_type=record_type,
+            parameters=record_set_model,
+            if_match=kwargs.get("if_match"),
+            if_none_match=kwargs.get("if_none_match"),
+            **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
+            **{zone["zone_name"]: zone_name},
+        )
         result = record_set.as_dict()
     except (HttpResponseError, ResourceNotFoundError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("dns", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("dns", exc, kwargs)
         result = {"error": str(exc)}
     except SerializationError as exc:
         result = {"error": f"The object model could not be parsed. ({str(exc)})"}
 
+    _clear_get_cache()
+
     return result
 
 
+def record_sets_bulk_create_or_update(
+    records, zone_name, resource_group, zone_type="Public", max_workers=16, **kwargs
+):
+    """
+    .. versionadded:: 4.2.0
+
+    Creates or updates several record sets within a DNS zone concurrently. Azure DNS has no batch operation for
+    record sets, so each record set is still created or updated by its own request.
+
+    :param records: A list of dictionaries, each containing the parameters of ``record_set_create_or_update`` for
+        one record set, such as ``name``, ``record_type``, and ``ttl`` along with the records themselves.
+
+    :param zone_name: The name of the DNS zone (without a terminating dot).
+
+    :param resource_group: The name of the resource group.
+
+    :param zone_type: The type of DNS zone (set default to Public)
+
+    :param max_workers: The maximum number of record sets to create or update at the same time. Defaults to 16.
+
+    A list with the result of ``record_set_create_or_update`` for each record set is returned in the same order as
+    the records.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_dns.record_sets_bulk_create_or_update
+            '[{name: myhost, record_type: A, ttl: 300, arecords: [{ipv4_address: 10.0.0.1}]},
+              {name: myalias, record_type: CNAME, ttl: 300, cname_record: {cname: myhost.myzone}}]'
+            myzone testgroup
+
+    """
+    if not records:
+        return []
+
+    results = []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(int(max_workers), len(records)))) as executor:
+        futures = []
+        for record in records:
+            try:
+                params = {**kwargs, **record}
+            except TypeError as exc:
+                futures.append({"error": f"The record set parameters are invalid. ({str(exc)})"})
+                continue
+            params.update(zone_name=zone_name, resource_group=resource_group, zone_type=zone_type)
+            futures.append(
+                saltext.azurerm.utils.azurerm.submit_with_context(
+                    executor, record_set_create_or_update, **params
+                )
+            )
+
+        for future in futures:
+            if isinstance(future, dict):
+                results.append(future)
+                continue
+            try:
+                results.append(future.result())
+            except TypeError as exc:
+                results.append({"error": f"The record set parameters are invalid. ({str(exc)})"})
+
+    return results
+
+
 def record_set_delete(name, zone_name, resource_group, record_type, zone_type="Public", **kwargs):
     """
     .. versionadded:: 3000
@@ -174,37 +298,35 @@ def record_set_delete(name, zone_name, resource_group, record_type, zone_type="P
         salt-call azurerm_dns.record_set_delete myhost myzone testgroup A
 
     """
+
     result = False
 
-    client = "dns"
-    if zone_type.lower() == "private":
-        client = "privatedns"
+    zone = _zone_type(zone_type)
+    if zone is None:
+        _invalid_zone_type(zone_type)
+        return False
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    record_set_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, "record_sets")
     try:
-        if zone_type.lower() == "private":
-            dnsconn.record_sets.delete(
-                relative_record_set_name=name,
-                private_zone_name=zone_name,
-                resource_group_name=resource_group,
-                record_type=record_type,
-                if_match=kwargs.get("if_match"),
-            )
-        else:
-            dnsconn.record_sets.delete(
-                relative_record_set_name=name,
-                zone_name=zone_name,
-                resource_group_name=resource_group,
-                record_type=record_type,
-                if_match=kwargs.get("if_match"),
-            )
+        record_set_ops.delete(
+            relative_record_set_name=name,
+            resource_group_name=resource_group,
+            record_type=record_type,
+            if_match=kwargs.get("if_match"),
+            **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
+            **{zone["zone_name"]: zone_name},
+        )
         result = True
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("dns", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("dns", exc, kwargs)
+
+    _clear_get_cache()
 
     return result
 
 
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_GET_CACHE_TTL)
 def record_set_get(name, zone_name, resource_group, record_type, zone_type="Public", **kwargs):
     """
     .. versionadded:: 3000
@@ -231,29 +353,23 @@ def record_set_get(name, zone_name, resource_group, record_type, zone_type="Publ
 
     """
 
-    client = "dns"
-    if zone_type.lower() == "private":
-        client = "privatedns"
+    zone = _zone_type(zone_type)
+    if zone is None:
+        return _invalid_zone_type(zone_type)
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    record_set_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, "record_sets")
     try:
-        if zone_type.lower() == "private":
-            record_set = dnsconn.record_sets.get(
-                relative_record_set_name=name,
-                private_zone_name=zone_name,
-                resource_group_name=resource_group,
-                record_type=record_type,
-            )
-        else:
-            record_set = dnsconn.record_sets.get(
-                relative_record_set_name=name,
-                zone_name=zone_name,
-                resource_group_name=resource_group,
-                record_type=record_type,
-            )
+        record_set = record_set_ops.get(
+            relative_record_set_name=name,
+            resource_group_name=resource_group,
+            record_type=record_type,
+            **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
+            **{zone["zone_name"]: zone_name},
+        )
         result = record_set.as_dict()
     except (ResourceNotFoundError, HttpResponseError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error(client, str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error(zone["client"], exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -266,6 +382,7 @@ def record_sets_list_by_type(
     top=None,
     recordsetnamesuffix=None,
     zone_type="Public",
+    raw=False,
     **kwargs,
 ):
     """
@@ -291,6 +408,13 @@ def record_sets_list_by_type(
 
     :param zone_type: The type of DNS zone (set default to Public)
 
+    :param raw: Set to ``True`` to return the record sets as they are represented by the Azure REST API, with
+        camel-cased property names nested under ``properties`` (for example ``properties.TTL`` and
+        ``properties.ARecords`` instead of ``ttl`` and ``a_records``). Decoding the listing directly is much faster
+        for large zones. By default, the record sets are returned in the same format as ``record_set_get``.
+
+        .. versionadded:: 4.2.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -298,45 +422,47 @@ def record_sets_list_by_type(
         salt-call azurerm_dns.record_sets_list_by_type myzone testgroup SOA
 
     """
+
     result = {}
 
-    client = "dns"
-    if zone_type.lower() == "private":
-        client = "privatedns"
+    zone = _zone_type(zone_type)
+    if zone is None:
+        return _invalid_zone_type(zone_type)
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    record_set_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, "record_sets")
     try:
-        if zone_type.lower() == "private":
-            record_sets = saltext.azurerm.utils.azurerm.paged_object_to_list(
-                dnsconn.record_sets.list_by_type(
-                    private_zone_name=zone_name,
-                    resource_group_name=resource_group,
-                    record_type=record_type,
-                    top=top,
-                    recordsetnamesuffix=recordsetnamesuffix,
-                )
+        list_kwargs = {
+            "resource_group_name": resource_group,
+            "record_type": record_type,
+            "top": top,
+            "recordsetnamesuffix": recordsetnamesuffix,
+            zone["zone_name"]: zone_name,
+            **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
+        }
+        if raw:
+            result = saltext.azurerm.utils.azurerm.paged_response_to_dict(
+                record_set_ops.list_by_type, **list_kwargs
             )
         else:
-            record_sets = saltext.azurerm.utils.azurerm.paged_object_to_list(
-                dnsconn.record_sets.list_by_type(
-                    zone_name=zone_name,
-                    resource_group_name=resource_group,
-                    record_type=record_type,
-                    top=top,
-                    recordsetnamesuffix=recordsetnamesuffix,
-                )
+            result = saltext.azurerm.utils.azurerm.paged_object_to_dict(
+                record_set_ops.list_by_type(**list_kwargs)
             )
-        for record_set in record_sets:
-            result[record_set["name"]] = record_set
     except (ResourceNotFoundError, HttpResponseError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("dns", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("dns", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
 
 
 def record_sets_list_by_dns_zone(
-    zone_name, resource_group, top=None, recordsetnamesuffix=None, zone_type="Public", **kwargs
+    zone_name,
+    resource_group,
+    top=None,
+    recordsetnamesuffix=None,
+    zone_type="Public",
+    raw=False,
+    **kwargs,
 ):
     """
     .. versionadded:: 3000
@@ -357,6 +483,13 @@ def record_sets_list_by_dns_zone(
 
     :param zone_type: The type of DNS zone (set default to Public)
 
+    :param raw: Set to ``True`` to return the record sets as they are represented by the Azure REST API, with
+        camel-cased property names nested under ``properties`` (for example ``properties.TTL`` and
+        ``properties.ARecords`` instead of ``ttl`` and ``a_records``). Decoding the listing directly is much faster
+        for large zones. By default, the record sets are returned in the same format as ``record_set_get``.
+
+        .. versionadded:: 4.2.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -364,43 +497,42 @@ def record_sets_list_by_dns_zone(
         salt-call azurerm_dns.record_sets_list_by_dns_zone myzone testgroup
 
     """
+
     result = {}
 
-    client = "dns"
-    if zone_type.lower() == "private":
-        client = "privatedns"
+    zone = _zone_type(zone_type)
+    if zone is None:
+        return _invalid_zone_type(zone_type)
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    record_set_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, "record_sets")
     try:
-        if zone_type.lower() == "private":
-            record_sets = saltext.azurerm.utils.azurerm.paged_object_to_list(
-                dnsconn.record_sets.list(
-                    private_zone_name=zone_name,
-                    resource_group_name=resource_group,
-                    top=top,
-                    recordsetnamesuffix=recordsetnamesuffix,
-                )
+        list_operation = getattr(record_set_ops, zone["list_record_sets"])
+        list_kwargs = {
+            "resource_group_name": resource_group,
+            "top": top,
+            "recordsetnamesuffix": recordsetnamesuffix,
+            zone["zone_name"]: zone_name,
+            **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
+        }
+        if raw:
+            result = saltext.azurerm.utils.azurerm.paged_response_to_dict(
+                list_operation, **list_kwargs
             )
         else:
-            record_sets = saltext.azurerm.utils.azurerm.paged_object_to_list(
-                dnsconn.record_sets.list_by_dns_zone(
-                    zone_name=zone_name,
-                    resource_group_name=resource_group,
-                    top=top,
-                    recordsetnamesuffix=recordsetnamesuffix,
-                )
+            result = saltext.azurerm.utils.azurerm.paged_object_to_dict(
+                list_operation(**list_kwargs)
             )
-
-        for record_set in record_sets:
-            result[record_set["name"]] = record_set
     except (ResourceNotFoundError, HttpResponseError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("dns", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("dns", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
 
 
-def zone_create_or_update(name, resource_group, zone_type="Public", **kwargs):
+def zone_create_or_update(
+    name, resource_group, zone_type="Public", operation_timeout=_OPERATION_TIMEOUT, **kwargs
+):
     """
     .. versionadded:: 3000
 
@@ -412,6 +544,12 @@ def zone_create_or_update(name, resource_group, zone_type="Public", **kwargs):
 
     :param zone_type: The type of DNS zone (set default to Public)
 
+    :param operation_timeout: The maximum number of seconds to wait for a private DNS zone to be created or updated.
+        An error is returned if the operation has not finished by then, although it carries on in Azure. Defaults to
+        600.
+
+        .. versionadded:: 4.2.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -419,66 +557,66 @@ def zone_create_or_update(name, resource_group, zone_type="Public", **kwargs):
         salt-call azurerm_dns.zone_create_or_update myzone testgroup
 
     """
+
     # DNS zones are global objects
     kwargs["location"] = "global"
 
-    client = "dns"
-    obj = "Zone"
-    if zone_type.lower() == "private":
-        client = "privatedns"
-        obj = "PrivateZone"
+    zone = _zone_type(zone_type)
+    if zone is None:
+        return _invalid_zone_type(zone_type)
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    zone_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, zone["zones"])
 
-    # Convert list of ID strings to list of dictionaries with id key.
-    if isinstance(kwargs.get("registration_virtual_networks"), list):
-        kwargs["registration_virtual_networks"] = [
-            {"id": vnet} for vnet in kwargs["registration_virtual_networks"]
-        ]
-
-    if isinstance(kwargs.get("resolution_virtual_networks"), list):
-        kwargs["resolution_virtual_networks"] = [
-            {"id": vnet} for vnet in kwargs["resolution_virtual_networks"]
-        ]
+    for vnets in ("registration_virtual_networks", "resolution_virtual_networks"):
+        if isinstance(kwargs.get(vnets), list):
+            kwargs[vnets] = _vnet_references(kwargs[vnets])
 
     try:
-        zone_model = saltext.azurerm.utils.azurerm.create_object_model(client, obj, **kwargs)
+        zone_model = saltext.azurerm.utils.azurerm.create_object_model(
+            zone["client"], zone["zone_model"], **kwargs
+        )
     except TypeError as exc:
         result = {"error": f"The object model could not be built. ({str(exc)})"}
         return result
 
     try:
-        if zone_type.lower() == "private":
-            zone = dnsconn.private_zones.begin_create_or_update(
-                private_zone_name=name,
-                resource_group_name=resource_group,
-                parameters=zone_model,
-                if_match=kwargs.get("if_match"),
-                if_none_match=kwargs.get("if_none_match"),
-                polling=True,
-            )
-            zone.wait()
-            zone_result = zone.result()
-            result = zone_result.as_dict()
+        zone_kwargs = {
+            zone["zone_name"]: name,
+            "resource_group_name": resource_group,
+            "parameters": zone_model,
+            "if_match": kwargs.get("if_match"),
+            "if_none_match": kwargs.get("if_none_match"),
+        }
+        if zone["client"] == "privatedns":
+            zone_kwargs.update(saltext.azurerm.utils.azurerm.lro_operation_kwargs(kwargs))
+            zone_kwargs.setdefault("polling", True)
+            poller = zone_ops.begin_create_or_update(**zone_kwargs)
+            poller.wait(operation_timeout)
+            if poller.done():
+                result = poller.result().as_dict()
+            else:
+                result = {
+                    "error": f"The DNS zone {name} was not created or updated within "
+                    f"{operation_timeout} seconds."
+                }
         else:
-            zone = dnsconn.zones.create_or_update(
-                zone_name=name,
-                resource_group_name=resource_group,
-                parameters=zone_model,
-                if_match=kwargs.get("if_match"),
-                if_none_match=kwargs.get("if_none_match"),
-            )
-            result = zone.as_dict()
+            zone_kwargs.update(saltext.azurerm.utils.azurerm.operation_kwargs(kwargs))
+            result = zone_ops.create_or_update(**zone_kwargs).as_dict()
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("dns", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("dns", exc, kwargs)
         result = {"error": str(exc)}
     except SerializationError as exc:
         result = {"error": f"The object model could not be parsed. ({str(exc)})"}
 
+    _clear_get_cache()
+
     return result
 
 
-def zone_delete(name, resource_group, zone_type="Public", **kwargs):
+def zone_delete(
+    name, resource_group, zone_type="Public", operation_timeout=_OPERATION_TIMEOUT, **kwargs
+):
     """
     .. versionadded:: 3000
 
@@ -490,6 +628,11 @@ def zone_delete(name, resource_group, zone_type="Public", **kwargs):
 
     :param zone_type: The type of DNS zone (set default to Public)
 
+    :param operation_timeout: The maximum number of seconds to wait for the DNS zone to be deleted. False is returned
+        if the deletion has not finished by then, although it carries on in Azure. Defaults to 600.
+
+        .. versionadded:: 4.2.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -497,35 +640,37 @@ def zone_delete(name, resource_group, zone_type="Public", **kwargs):
         salt-call azurerm_dns.zone_delete myzone testgroup
 
     """
+
     result = False
 
-    client = "dns"
-    if zone_type.lower() == "private":
-        client = "privatedns"
+    zone = _zone_type(zone_type)
+    if zone is None:
+        _invalid_zone_type(zone_type)
+        return False
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    zone_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, zone["zones"])
     try:
-        if zone_type.lower() == "private":
-            zone = dnsconn.private_zones.begin_delete(
-                private_zone_name=name,
-                resource_group_name=resource_group,
-                if_match=kwargs.get("if_match"),
-                polling=True,
-            )
+        poller = zone_ops.begin_delete(
+            resource_group_name=resource_group,
+            if_match=kwargs.get("if_match"),
+            **saltext.azurerm.utils.azurerm.lro_operation_kwargs(kwargs),
+            **{zone["zone_name"]: name},
+        )
+        poller.wait(operation_timeout)
+        if poller.done():
+            result = True
         else:
-            zone = dnsconn.zones.begin_delete(
-                zone_name=name,
-                resource_group_name=resource_group,
-                if_match=kwargs.get("if_match"),
-            )
-        zone.wait()
-        result = True
+            log.error("The DNS zone %s was not deleted within %s seconds.", name, operation_timeout)
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("dns", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("dns", exc, kwargs)
+
+    _clear_get_cache()
 
     return result
 
 
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_GET_CACHE_TTL)
 def zone_get(name, resource_group, zone_type="Public", **kwargs):
     """
     .. versionadded:: 3000
@@ -546,23 +691,21 @@ def zone_get(name, resource_group, zone_type="Public", **kwargs):
         salt-call azurerm_dns.zone_get myzone testgroup
 
     """
-    client = "dns"
-    if zone_type.lower() == "private":
-        client = "privatedns"
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
-    try:
-        if zone_type.lower() == "private":
-            zone = dnsconn.private_zones.get(
-                private_zone_name=name, resource_group_name=resource_group
-            )
-            result = zone.as_dict()
-        else:
-            zone = dnsconn.zones.get(zone_name=name, resource_group_name=resource_group)
-            result = zone.as_dict()
+    zone = _zone_type(zone_type)
+    if zone is None:
+        return _invalid_zone_type(zone_type)
 
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    zone_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, zone["zones"])
+    try:
+        result = zone_ops.get(
+            resource_group_name=resource_group,
+            **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
+            **{zone["zone_name"]: name},
+        ).as_dict()
     except (ResourceNotFoundError, HttpResponseError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("dns", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("dns", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -589,29 +732,25 @@ def zones_list_by_resource_group(resource_group, zone_type="Public", top=None, *
         salt-call azurerm_dns.zones_list_by_resource_group testgroup
 
     """
+
     result = {}
 
-    client = "dns"
-    if zone_type.lower() == "private":
-        client = "privatedns"
+    zone = _zone_type(zone_type)
+    if zone is None:
+        return _invalid_zone_type(zone_type)
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    zone_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, zone["zones"])
     try:
-        if zone_type.lower() == "private":
-            zones = saltext.azurerm.utils.azurerm.paged_object_to_list(
-                dnsconn.private_zones.list_by_resource_group(
-                    resource_group_name=resource_group, top=top
-                )
-            )
-        else:
-            zones = saltext.azurerm.utils.azurerm.paged_object_to_list(
-                dnsconn.zones.list_by_resource_group(resource_group_name=resource_group, top=top)
+        result = saltext.azurerm.utils.azurerm.paged_object_to_dict(
+            zone_ops.list_by_resource_group(
+                resource_group_name=resource_group,
+                top=top,
+                **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs),
             )
-
-        for zone in zones:
-            result[zone["name"]] = zone
+        )
     except (ResourceNotFoundError, HttpResponseError) as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("dns", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("dns", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
@@ -636,25 +775,21 @@ def zones_list(top=None, zone_type="Public", **kwargs):
         salt-call azurerm_dns.zones_list
 
     """
+
     result = {}
 
-    client = "dns"
-    if zone_type.lower() == "private":
-        client = "privatedns"
+    zone = _zone_type(zone_type)
+    if zone is None:
+        return _invalid_zone_type(zone_type)
 
-    dnsconn = saltext.azurerm.utils.azurerm.get_client(client, **kwargs)
+    dnsconn = saltext.azurerm.utils.azurerm.get_client(zone["client"], **kwargs)
+    zone_ops = saltext.azurerm.utils.azurerm.get_operation_group(dnsconn, zone["zones"])
     try:
-        if zone_type.lower() == "private":
-            zones = saltext.azurerm.utils.azurerm.paged_object_to_list(
-                dnsconn.private_zones.list(top=top)
-            )
-        else:
-            zones = saltext.azurerm.utils.azurerm.paged_object_to_list(dnsconn.zones.list(top=top))
-
-        for zone in zones:
-            result[zone["name"]] = zone
+        result = saltext.azurerm.utils.azurerm.paged_object_to_dict(
+            zone_ops.list(top=top, **saltext.azurerm.utils.azurerm.operation_kwargs(kwargs))
+        )
     except HttpResponseError as exc:
-        saltext.azurerm.utils.azurerm.log_cloud_error("dns", str(exc), **kwargs)
+        saltext.azurerm.utils.azurerm.log_cloud_error("dns", exc, kwargs)
         result = {"error": str(exc)}
 
     return result
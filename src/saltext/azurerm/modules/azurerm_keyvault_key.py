@@ -36,8 +36,10 @@ Azure Resource Manager Key Execution Module
 """
 
 # Python libs
-import datetime
+import functools
+import importlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import saltext.azurerm.utils.azurerm
 
@@ -48,9 +50,9 @@ try:
     from azure.core.exceptions import ResourceExistsError
     from azure.core.exceptions import ResourceNotFoundError
     from azure.core.exceptions import SerializationError
-    from azure.keyvault.keys import KeyClient
 
-    HAS_LIBS = True
+    # The Key Vault package is only looked for here. It is imported once a key client or key is built.
+    HAS_LIBS = saltext.azurerm.utils.azurerm.has_modules("azure.keyvault.keys")
 except ImportError:
     pass
 
@@ -58,12 +60,64 @@ __func_alias__ = {"list_": "list"}
 
 log = logging.getLogger(__name__)
 
+# The attributes of Key objects and of their properties which are returned by this module
+_KEY_ATTRS = ("id", "key_operations", "key_type", "name", "properties")
+_KEY_PROPS = (
+    "created_on",
+    "enabled",
+    "expires_on",
+    "id",
+    "managed",
+    "name",
+    "not_before",
+    "recovery_level",
+    "tags",
+    "updated_on",
+    "vault_url",
+    "version",
+)
+# The key properties which are datetimes, and are returned in ISO-8601 format
+_DATETIME_PROPS = ("created_on", "expires_on", "not_before", "updated_on")
+# The key types accepted by this module, and the names used for them by the Key Vault API
+_KEY_TYPES = {
+    "ec": "EC",
+    "ec_hsm": "EC-HSM",
+    "oct": "oct",
+    "oct_hsm": "oct-HSM",
+    "rsa": "RSA",
+    "rsa_hsm": "RSA-HSM",
+}
+# States look up the same keys repeatedly within a run, so lookups are cached briefly. The cache is cleared whenever
+# a key is written.
+_GET_CACHE_TTL = 60
+
+# The parameters of imported keys, as defined in https://tools.ietf.org/html/draft-ietf-jose-json-web-key-18
+_JWK_FIELDS = (
+    "kid",
+    "kty",
+    "key_ops",
+    "n",
+    "e",
+    "d",
+    "dp",
+    "dq",
+    "qi",
+    "p",
+    "q",
+    "k",
+    "t",
+    "crv",
+    "x",
+    "y",
+)
+
 
 def get_key_client(vault_url, **kwargs):
     """
     .. versionadded:: 2.1.0
 
-    Load the key client and return a KeyClient object.
+    Load the key client and return a KeyClient object. The client is cached and reused by later calls
+    for the same vault with the same credentials.
 
     :param vault_url: The URL of the vault that the client will access.
 
@@ -73,23 +127,26 @@ def get_key_client(vault_url, **kwargs):
 
         salt-call azurerm_keyvault_key.get_key_client https://myvault.vault.azure.net/
     """
-    credential = saltext.azurerm.utils.azurerm.get_identity_credentials(**kwargs)
-    key_client = KeyClient(vault_url=vault_url, credential=credential)
+    return saltext.azurerm.utils.azurerm.get_vault_client(
+        _keys_class("KeyClient"), vault_url, **kwargs
+    )
+
 
-    return key_client
+@functools.lru_cache(maxsize=None)
+def _keys_class(name):
+    """
+    Look up a class of the Key Vault keys package by name. The package is only imported on first use, and the lookup
+    is memoized.
+    """
+    return getattr(importlib.import_module("azure.keyvault.keys"), name)
 
 
 def _key_as_dict(key):
     """
     Helper function to return a Key object as a dictionary
     """
-    result = {}
-    attrs = ["id", "key_operations", "key_type", "name", "properties"]
-    for attr in attrs:
-        val = getattr(key, attr)
-        if attr == "properties":
-            val = _key_properties_as_dict(val)
-        result[attr] = val
+    result = {attr: getattr(key, attr) for attr in _KEY_ATTRS}
+    result["properties"] = _key_properties_as_dict(result["properties"])
     return result
 
 
@@ -97,26 +154,45 @@ def _key_properties_as_dict(key_properties):
     """
     Helper function to return Key properties as a dictionary
     """
+    result = {prop: getattr(key_properties, prop) for prop in _KEY_PROPS}
+    for prop in _DATETIME_PROPS:
+        val = result[prop]
+        if val is not None:
+            result[prop] = val.isoformat()
+    return result
+
+
+def _clear_get_cache():
+    """
+    Forget the cached keys after a write, so that they are looked up again.
+    """
+    get_deleted_key.cache_clear()
+    get_key.cache_clear()
+    list_properties_of_key_versions.cache_clear()
+
+
+def _bulk_action(action, names, vault_url, max_workers=16, **kwargs):
+    """
+    Run a single key operation against several keys in the same vault concurrently, returning the result of each
+    operation keyed by key name.
+    """
     result = {}
-    props = [
-        "created_on",
-        "enabled",
-        "expires_on",
-        "id",
-        "managed",
-        "name",
-        "not_before",
-        "recovery_level",
-        "tags",
-        "updated_on",
-        "vault_url",
-        "version",
-    ]
-    for prop in props:
-        val = getattr(key_properties, prop)
-        if isinstance(val, datetime.datetime):
-            val = val.isoformat()
-        result[prop] = val
+
+    with ThreadPoolExecutor(max_workers=max(1, min(int(max_workers), len(names)))) as executor:
+        futures = {
+            name: saltext.azurerm.utils.azurerm.submit_with_context(
+                executor, action, name=name, vault_url=vault_url, **kwargs
+            )
+            for name in names
+        }
+
+        for name, future in futures.items():
+            try:
+                result[name] = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error("Unable to run %s for key %s: %s", action.__name__, name, exc)
+                result[name] = {"error": str(exc)}
+
     return result
 
 
@@ -153,7 +229,7 @@ def backup_key(name, vault_url, **kwargs):
     return result
 
 
-def begin_delete_key(name, vault_url, **kwargs):
+def begin_delete_key(name, vault_url, wait=True, polling_interval=None, **kwargs):
     """
     .. versionadded:: 2.1.0
 
@@ -164,6 +240,16 @@ def begin_delete_key(name, vault_url, **kwargs):
 
     :param vault_url: The URL of the vault that the client will access.
 
+    :param wait: Wait for the deletion to complete before returning. Defaults to True. When set to False, the function
+        returns as soon as Key Vault has begun deleting the key.
+
+        .. versionadded:: 4.2.0
+
+    :param polling_interval: The number of seconds to wait between checks for the completion of the deletion. Defaults
+        to 2.
+
+        .. versionadded:: 4.2.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -175,17 +261,20 @@ def begin_delete_key(name, vault_url, **kwargs):
     kconn = get_key_client(vault_url, **kwargs)
 
     try:
-        key = kconn.begin_delete_key(name=name)
+        key = kconn.begin_delete_key(name=name, _polling_interval=polling_interval)
 
-        key.wait()
+        if wait:
+            key.wait()
         result = _key_as_dict(key.result())
     except (ResourceNotFoundError, HttpResponseError) as exc:
         result = {"error": str(exc)}
 
+    _clear_get_cache()
+
     return result
 
 
-def begin_recover_deleted_key(name, vault_url, **kwargs):
+def begin_recover_deleted_key(name, vault_url, wait=True, polling_interval=None, **kwargs):
     """
     .. versionadded:: 2.1.0
 
@@ -197,6 +286,16 @@ def begin_recover_deleted_key(name, vault_url, **kwargs):
 
     :param vault_url: The URL of the vault that the client will access.
 
+    :param wait: Wait for the recovery to complete before returning. Defaults to True. When set to False, the function
+        returns as soon as Key Vault has begun recovering the key.
+
+        .. versionadded:: 4.2.0
+
+    :param polling_interval: The number of seconds to wait between checks for the completion of the recovery. Defaults
+        to 2.
+
+        .. versionadded:: 4.2.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -208,16 +307,88 @@ def begin_recover_deleted_key(name, vault_url, **kwargs):
     kconn = get_key_client(vault_url, **kwargs)
 
     try:
-        key = kconn.begin_recover_deleted_key(name=name)
+        key = kconn.begin_recover_deleted_key(name=name, _polling_interval=polling_interval)
 
-        key.wait()
+        if wait:
+            key.wait()
         result = _key_as_dict(key.result())
     except HttpResponseError as exc:
         result = {"error": str(exc)}
 
+    _clear_get_cache()
+
     return result
 
 
+def bulk_backup_key(names, vault_url, max_workers=16, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Back up multiple keys concurrently. The backup of each key is returned keyed by key name. Requires keys/backup
+    permission.
+
+    :param names: A list of the names of the keys to back up.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param max_workers: The maximum number of keys to back up at the same time. Defaults to 16.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_keyvault_key.bulk_backup_key '["test_name1", "test_name2"]' test_vault
+
+    """
+    return _bulk_action(backup_key, names, vault_url, max_workers=max_workers, **kwargs)
+
+
+def bulk_delete_key(names, vault_url, max_workers=16, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Delete multiple keys concurrently, including all of their versions. The deleted keys are returned keyed by key
+    name. Requires keys/delete permission.
+
+    :param names: A list of the names of the keys to delete.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param max_workers: The maximum number of keys to delete at the same time. Defaults to 16.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_keyvault_key.bulk_delete_key '["test_name1", "test_name2"]' test_vault
+
+    """
+    return _bulk_action(begin_delete_key, names, vault_url, max_workers=max_workers, **kwargs)
+
+
+def bulk_get_keys(names, vault_url, max_workers=16, **kwargs):
+    """
+    .. versionadded:: 4.2.0
+
+    Get the latest version of multiple keys concurrently. The keys are returned keyed by key name. Requires keys/get
+    permission.
+
+    :param names: A list of the names of the keys to get.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param max_workers: The maximum number of keys to get at the same time. Defaults to 16.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-call azurerm_keyvault_key.bulk_get_keys '["test_name1", "test_name2"]' test_vault
+
+    """
+    return _bulk_action(get_key, names, vault_url, max_workers=max_workers, **kwargs)
+
+
 def create_ec_key(
     name,
     vault_url,
@@ -285,6 +456,8 @@ def create_ec_key(
     except HttpResponseError as exc:
         result = {"error": str(exc)}
 
+    _clear_get_cache()
+
     return result
 
 
@@ -309,7 +482,8 @@ def create_key(
 
     :param name: The name of the new key. Key names can only contain alphanumeric characters and dashes.
 
-    :param key_type: The type of key to create. Possible values include: 'ec', 'ec_hsm', 'oct', 'rsa', 'rsa_hsm'.
+    :param key_type: The type of key to create. Possible values include: 'ec', 'ec_hsm', 'oct', 'oct_hsm', 'rsa',
+        'rsa_hsm'.
 
     :param vault_url: The URL of the vault that the client will access.
 
@@ -341,8 +515,7 @@ def create_key(
     result = {}
     kconn = get_key_client(vault_url, **kwargs)
 
-    if key_type != "oct":
-        key_type = key_type.upper().replace("_", "-")
+    key_type = _KEY_TYPES.get(str(key_type).lower().replace("-", "_"), key_type)
 
     try:
         key = kconn.create_key(
@@ -361,6 +534,8 @@ def create_key(
     except HttpResponseError as exc:
         result = {"error": str(exc)}
 
+    _clear_get_cache()
+
     return result
 
 
@@ -430,9 +605,12 @@ def create_rsa_key(
     except HttpResponseError as exc:
         result = {"error": str(exc)}
 
+    _clear_get_cache()
+
     return result
 
 
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_GET_CACHE_TTL)
 def get_deleted_key(name, vault_url, **kwargs):
     """
     .. versionadded:: 2.1.0
@@ -463,6 +641,7 @@ def get_deleted_key(name, vault_url, **kwargs):
     return result
 
 
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_GET_CACHE_TTL)
 def get_key(name, vault_url, version=None, **kwargs):
     """
     .. versionadded:: 2.1.0
@@ -536,7 +715,7 @@ def import_key(
 
     :param kid: Key identifier.
 
-    :param kty: Key type. Possible values inclide: 'ec', 'ec_hsm', 'oct', 'rsa', 'rsa_hsm'.
+    :param kty: Key type. Possible values include: 'ec', 'ec_hsm', 'oct', 'oct_hsm', 'rsa', 'rsa_hsm'.
 
     :param key_ops: A list of allow operations for the key. Possible elements of the list include: 'decrypt',
         'encrypt', 'sign', 'unwrap_key', 'verify', 'wrap_key'
@@ -577,16 +756,13 @@ def import_key(
     result = {}
     kconn = get_key_client(vault_url, **kwargs)
 
-    if kwargs["key_type"] != "oct":
-        kwargs["key_type"] = kwargs.get("key_type").upper().replace("_", "-")
+    # the key type was previously passed as key_type, which is still accepted
+    kwargs.setdefault("kty", kwargs.get("key_type"))
+    kwargs["kty"] = _KEY_TYPES.get(str(kwargs["kty"]).lower().replace("-", "_"), kwargs["kty"])
 
-    try:
-        keymodel = saltext.azurerm.utils.azurerm.create_object_model(
-            "keyvault-keys", "JsonWebKey", **kwargs
-        )
-    except TypeError as exc:
-        result = {"error": f"The object model could not be built. ({str(exc)})"}
-        return result
+    keymodel = _keys_class("JsonWebKey")(
+        **{field: kwargs[field] for field in _JWK_FIELDS if field in kwargs}
+    )
 
     try:
         key = kconn.import_key(
@@ -603,6 +779,8 @@ def import_key(
     except HttpResponseError as exc:
         result = {"error": str(exc)}
 
+    _clear_get_cache()
+
     return result
 
 
@@ -627,14 +805,16 @@ def list_(vault_url, **kwargs):
     try:
         keys = kconn.list_properties_of_keys()
 
-        for key in keys:
-            result[key.name] = _key_properties_as_dict(key)
+        result = saltext.azurerm.utils.azurerm.paged_object_to_dict(
+            keys, convert=_key_properties_as_dict
+        )
     except ResourceNotFoundError as exc:
         result = {"error": str(exc)}
 
     return result
 
 
+@saltext.azurerm.utils.azurerm.ttl_cache(ttl=_GET_CACHE_TTL)
 def list_properties_of_key_versions(name, vault_url, **kwargs):
     """
     .. versionadded:: 2.1.0
@@ -658,8 +838,9 @@ def list_properties_of_key_versions(name, vault_url, **kwargs):
     try:
         keys = kconn.list_properties_of_key_versions(name=name)
 
-        for key in keys:
-            result[key.name] = _key_properties_as_dict(key)
+        result = saltext.azurerm.utils.azurerm.paged_object_to_dict(
+            keys, convert=_key_properties_as_dict
+        )
     except ResourceNotFoundError as exc:
         result = {"error": str(exc)}
 
@@ -688,8 +869,7 @@ def list_deleted_keys(vault_url, **kwargs):
     try:
         keys = kconn.list_deleted_keys()
 
-        for key in keys:
-            result[key.name] = _key_as_dict(key)
+        result = saltext.azurerm.utils.azurerm.paged_object_to_dict(keys, convert=_key_as_dict)
     except ResourceNotFoundError as exc:
         result = {"error": str(exc)}
 
@@ -726,6 +906,8 @@ def purge_deleted_key(name, vault_url, **kwargs):
     except HttpResponseError as exc:
         result = {"error": str(exc)}
 
+    _clear_get_cache()
+
     return result
 
 
@@ -760,6 +942,8 @@ def restore_key_backup(backup, vault_url, **kwargs):
     except (ResourceExistsError, HttpResponseError, SerializationError) as exc:
         result = {"error": str(exc)}
 
+    _clear_get_cache()
+
     return result
 
 
@@ -825,4 +1009,6 @@ def update_key_properties(
     except (ResourceNotFoundError, HttpResponseError) as exc:
         result = {"error": str(exc)}
 
+    _clear_get_cache()
+
     return result
@@ -194,7 +194,7 @@ def zone_present(
         return ret
 
     zone = __salt__["azurerm_dns.zone_get"](
-        name, resource_group, azurerm_log_level="info", **connection_auth
+        name, resource_group, azurerm_log_level="info", zone_type=zone_type, **connection_auth
     )
 
     if "error" not in zone:
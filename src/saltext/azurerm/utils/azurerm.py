@@ -20,11 +20,26 @@ Azure Resource Manager Utilities
 
 """
 
+import atexit
+import collections
+import contextvars
+import copy
+import datetime
+import email.utils
+import functools
+import hashlib
 import importlib
+import importlib.util
+import json
 import logging
 import os
+import random
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from operator import itemgetter
+from operator import methodcaller
 
 import salt.config  # pylint: disable=import-error
 import salt.loader  # pylint: disable=import-error
@@ -34,23 +49,92 @@ from salt.exceptions import SaltInvocationError  # pylint: disable=import-error
 from salt.exceptions import SaltSystemExit  # pylint: disable=import-error
 
 try:
+    import requests
     from azure.core.exceptions import ClientAuthenticationError
+    from azure.core.pipeline.policies import RetryPolicy
     from azure.core.pipeline.policies import UserAgentPolicy
+    from azure.core.pipeline.transport import RequestsTransport
+    from azure.core.rest import HttpRequest
     from azure.identity import AzureAuthorityHosts
+    from azure.identity import ClientSecretCredential
     from azure.identity import DefaultAzureCredential
     from azure.identity import KnownAuthorities
+    from azure.identity import TokenCachePersistenceOptions
+    from azure.mgmt.core.polling.arm_polling import ARMPolling
     from msrestazure.azure_cloud import MetadataEndpointError
     from msrestazure.azure_cloud import get_cloud_from_metadata_endpoint
+    from urllib3.util.retry import Retry
 
     HAS_AZURE = True
 except ImportError:
     HAS_AZURE = False
+    ARMPolling = object
+    RetryPolicy = object
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 __opts__ = salt.config.minion_config("/etc/salt/minion")
 __salt__ = salt.loader.minion_mods(__opts__)
 
 log = logging.getLogger(__name__)
 
+# The maximum number of requests accepted by a single Azure Resource Manager batch request
+BATCH_MAX_REQUESTS = 20
+BATCH_API_VERSION = "2020-06-01"
+# The maximum number of seconds to wait for a batch request which is processed asynchronously, and the number of
+# seconds to wait between status checks when the service does not send a usable Retry-After header
+BATCH_MAX_WAIT = 60
+BATCH_DEFAULT_RETRY_AFTER = 1
+
+# Management clients are reused for the lifetime of the process, keyed by client type and the
+# keyword arguments which determine the credentials and endpoints they are built with
+_CLIENT_CACHE = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+_CLIENT_CACHE_KEYS = (
+    "subscription_id",
+    "tenant",
+    "client_id",
+    "client_certificate_path",
+    "username",
+    "cloud_environment",
+    "profile",
+    "persistent_token_cache",
+    "allow_unencrypted_token_cache",
+)
+_CLIENT_CACHE_SECRET_KEYS = ("secret", "password")
+# The size of the HTTP connection pool shared by the management clients built by get_client
+TRANSPORT_POOL_SIZE = 50
+
+# The retry settings of the management clients built by get_client. Retry-After headers sent by the service are
+# always honored; otherwise the exponential backoff is capped and a random jitter is added to it.
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 0.25
+RETRY_BACKOFF_MAX = 20
+RETRY_JITTER = 0.5
+
+# The keyword arguments which are passed on to the operations of the management clients, as opposed to the
+# credentials and options consumed by get_client
+OPERATION_KWARGS = frozenset(("headers", "timeout", "retry_total"))
+# The keyword arguments which are only accepted by the long-running begin_* operations
+LRO_OPERATION_KWARGS = OPERATION_KWARGS | frozenset(
+    ("continuation_token", "polling", "polling_interval")
+)
+
+# Setting this environment variable to 0, false or no disables the client cache, e.g. for tests
+CLIENT_CACHE_ENV_VAR = "SALTEXT_AZURERM_CLIENT_CACHE"
+# Setting this environment variable to 1, true or yes opens a connection to the Resource Manager endpoint in the
+# background when the first management client is built
+WARM_CONNECTION_ENV_VAR = "SALTEXT_AZURERM_WARM_CONNECTION"
+
+# API versions resolved from the profiles of the multi-API clients, keyed by client class, profile and
+# operation group
+_API_VERSIONS = {}
+
 
 def __virtual__():
     if not HAS_AZURE:
@@ -122,6 +206,75 @@ def _determine_auth(**kwargs):
 def get_client(client_type, **kwargs):
     """
     Dynamically load the selected client and return a management client object
+
+    Clients are cached for the lifetime of the process and reused by later calls made with the same
+    client type and credentials, so that credential and pipeline construction (and token acquisition)
+    are not repeated for every call.
+
+    An azure-core ``HttpTransport`` instance can be passed via the ``transport`` keyword argument in
+    order to replace the default HTTP transport used by the client pipeline. Clients built with a
+    custom transport are not cached.
+
+    Unless a custom transport is passed, all clients share a single HTTP transport, so that connections
+    are reused between the clients for the different services. Setting the
+    ``SALTEXT_AZURERM_WARM_CONNECTION`` environment variable to ``1``, ``true`` or ``yes`` opens the
+    first connection of the shared transport in the background while the client is being built.
+
+    Caching can be disabled by setting the ``SALTEXT_AZURERM_CLIENT_CACHE`` environment variable to
+    ``0``, ``false`` or ``no``, and cached clients can be discarded with ``clear_client_cache``.
+    """
+    Client = _client_class(client_type)  # pylint: disable=invalid-name
+
+    client_kwargs = {}
+    transport = kwargs.pop("transport", None)
+    if transport is not None:
+        client_kwargs["transport"] = transport
+
+    if transport is not None or not _client_cache_enabled():
+        return _build_client(client_type, Client, client_kwargs, **kwargs)
+
+    cache_key = _client_cache_key(client_type, **kwargs)
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(cache_key)
+        if client is None:
+            client = _build_client(client_type, Client, client_kwargs, **kwargs)
+            _CLIENT_CACHE[cache_key] = client
+
+    return client
+
+
+def get_vault_client(client_class, vault_url, **kwargs):
+    """
+    Return a Key Vault data plane client, such as a ``KeyClient``, for a vault
+
+    .. versionadded:: 4.2.0
+
+    Like management clients, vault clients are cached for the lifetime of the process and reused by
+    later calls made for the same vault with the same credentials. The identity credential is kept
+    with the client, so that the access tokens it acquired are reused as well. The same
+    ``SALTEXT_AZURERM_CLIENT_CACHE`` environment variable and ``clear_client_cache`` function apply.
+
+    Vault clients use the HTTP transport shared by the management clients, so that connections to a
+    vault are reused by all of its clients.
+    """
+    if not _client_cache_enabled():
+        return _build_vault_client(client_class, vault_url, **kwargs)
+
+    cache_key = _client_cache_key((client_class, vault_url), **kwargs)
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(cache_key)
+        if client is None:
+            client = _build_vault_client(client_class, vault_url, **kwargs)
+            _CLIENT_CACHE[cache_key] = client
+
+    return client
+
+
+@functools.lru_cache(maxsize=None)
+def _client_class(client_type):
+    """
+    Import and return the management client class for a client type. The class is only looked up on the first call
+    for each client type.
     """
     client_map = {
         "compute": "ComputeManagement",
@@ -160,29 +313,268 @@ def get_client(client_type, **kwargs):
         raise SaltSystemExit(  # pylint: disable=raise-missing-from
             f"The azure {client_type} client is not available."
         )
+
+    return Client
+
+
+@functools.lru_cache(maxsize=None)
+def has_modules(*module_names):
+    """
+    Check whether all of the named modules are installed, without importing them. The answers are cached, so that the
+    modules of the extension checking for the same Azure packages only look for them once.
+    """
+    try:
+        return all(importlib.util.find_spec(name) is not None for name in module_names)
+    except (ImportError, ValueError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def get_operation_group(client, operation_group):
+    """
+    Return an operation group of a management client, such as ``virtual_machine_images``. Multi-API clients build a
+    new operation group, along with serializers for all of the models of its API version, every time the attribute is
+    accessed, so the operation groups are cached on the client.
+    """
+    groups = client.__dict__.setdefault("_saltext_operation_groups", {})
+    group = groups.get(operation_group)
+    if group is None:
+        group = groups[operation_group] = getattr(client, operation_group)
+
+    return group
+
+
+def get_api_version(client, operation_group):
+    """
+    Return the API version which a multi-API management client uses for an operation group. The versions resolved
+    from the profile of the client are cached per client class, profile and operation group.
+    """
+    key = (type(client), getattr(client, "profile", None), operation_group)
+    api_version = _API_VERSIONS.get(key)
+    if api_version is None:
+        api_version = client._get_api_version(operation_group)  # pylint: disable=protected-access
+        _API_VERSIONS[key] = api_version
+
+    return api_version
+
+
+def clear_client_cache():
+    """
+    Close and discard all cached management clients, so that the next call to ``get_client`` builds
+    (and authenticates) a new client. This also runs when the interpreter exits, so that the
+    connections held by the clients are released.
+    """
+    with _CLIENT_CACHE_LOCK:
+        clients = list(_CLIENT_CACHE.values())
+        _CLIENT_CACHE.clear()
+
+    for client in clients:
+        try:
+            client.close()
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug("Unable to close a cached management client: %s", exc)
+
+
+atexit.register(clear_client_cache)
+
+
+def _client_cache_enabled():
+    """
+    Check whether management clients should be cached
+    """
+    return os.environ.get(CLIENT_CACHE_ENV_VAR, "1").strip().lower() not in ("0", "false", "no")
+
+
+def _warm_connection_enabled():
+    """
+    Check whether a connection to the Resource Manager endpoint should be opened ahead of the first request
+    """
+    return os.environ.get(WARM_CONNECTION_ENV_VAR, "0").strip().lower() in ("1", "true", "yes")
+
+
+def ttl_cache(ttl=3600, maxsize=1024):
+    """
+    Decorator which caches the results of a function for ``ttl`` seconds, keyed by the arguments it
+    was called with. Secrets within the keyword arguments are hashed rather than kept in the keys,
+    and the least recently used results are discarded once ``maxsize`` results are cached.
+
+    Results which are dictionaries containing an ``error`` key are not cached. Copies of the cached
+    results are returned, so that callers cannot modify them. The cache of a decorated function can
+    be emptied with its ``cache_clear`` attribute.
+    """
+
+    def decorator(func):
+        cache = collections.OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _call_cache_key(args, kwargs)
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(key)
+                    return copy.deepcopy(entry[1])
+
+            result = func(*args, **kwargs)
+
+            if not (isinstance(result, dict) and isinstance(result.get("error"), str)):
+                with lock:
+                    cache[key] = (now + ttl, copy.deepcopy(result))
+                    cache.move_to_end(key)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+
+            return result
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+def _call_cache_key(args, kwargs):
+    """
+    Build a hashable key from the arguments of a function call. Secrets are hashed rather than kept
+    in the key, and the ``__pub_*`` job details passed by Salt are left out.
+    """
+    return (
+        tuple(repr(arg) for arg in args),
+        tuple(
+            (
+                keyword,
+                _secret_digest(str(value)) if keyword in _CLIENT_CACHE_SECRET_KEYS else repr(value),
+            )
+            for keyword, value in sorted(kwargs.items())
+            if not keyword.startswith("__")
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _secret_digest(secret):
+    """
+    Hash a secret for use in a cache key. The same few credentials are passed to every call, so their digests are
+    only computed once.
+    """
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def _client_cache_key(client_type, **kwargs):
+    """
+    Build a hashable key for a management client from the keyword arguments which affect how it is
+    authenticated. Secrets are hashed rather than kept in the key.
+    """
+    key = [client_type]
+    key.extend((keyword, str(kwargs.get(keyword))) for keyword in _CLIENT_CACHE_KEYS)
+    key.extend(
+        (keyword, _secret_digest(str(kwargs[keyword])))
+        for keyword in _CLIENT_CACHE_SECRET_KEYS
+        if kwargs.get(keyword)
+    )
+    return tuple(key)
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_transport():
+    """
+    Build the HTTP transport shared by the management clients. The session is not owned by the
+    transport, so closing one of the clients does not close it for the others.
+    """
+    session = requests.Session()
+    # retries are handled by the client pipelines, as with the sessions created by azure-core itself
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=TRANSPORT_POOL_SIZE,
+        pool_maxsize=TRANSPORT_POOL_SIZE,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return RequestsTransport(session=session, session_owner=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _warm_connection(session, url):
+    """
+    Open a connection to an endpoint in the background, so that it is already in the pool of the
+    session when the first request is made, rather than being opened while the client acquires its
+    token. Failures are ignored, as the connection is opened on demand anyway.
+    """
+    if not isinstance(url, str):
+        return
+
+    def _connect():
+        try:
+            session.head(url, timeout=2)
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug("Unable to open a connection to %s: %s", url, exc)
+
+    threading.Thread(target=_connect, daemon=True).start()
+
+
+def _build_vault_client(client_class, vault_url, **kwargs):
+    """
+    Authenticate and instantiate a Key Vault data plane client
+    """
+    return client_class(
+        vault_url=vault_url,
+        credential=get_identity_credentials(**kwargs),
+        transport=_shared_transport(),
+    )
+
+
+def _build_client(client_type, client_class, client_kwargs, **kwargs):
+    """
+    Authenticate and instantiate a management client
+    """
+    client_kwargs.setdefault("transport", _shared_transport())
+    client_kwargs.setdefault(
+        "retry_policy",
+        JitteredRetryPolicy(
+            retry_total=RETRY_TOTAL,
+            retry_backoff_factor=RETRY_BACKOFF_FACTOR,
+            retry_backoff_max=RETRY_BACKOFF_MAX,
+        ),
+    )
     credentials, subscription_id, cloud_env = _determine_auth(**kwargs)
+    if client_kwargs["transport"] is _shared_transport() and _warm_connection_enabled():
+        _warm_connection(client_kwargs["transport"].session, cloud_env.endpoints.resource_manager)
 
     user_agent = UserAgentPolicy(f"Salt/{salt.version.__version__}")
     if client_type == "subscription":
-        client = Client(
+        client = client_class(
             credential=credentials,
             base_url=cloud_env.endpoints.resource_manager,
             user_agent_policy=user_agent,
+            **client_kwargs,
         )
     else:
-        client = Client(
+        client = client_class(
             credential=credentials,
             subscription_id=subscription_id,
             base_url=cloud_env.endpoints.resource_manager,
             user_agent_policy=user_agent,
+            **client_kwargs,
         )
     return client
 
 
-def log_cloud_error(client, message, **kwargs):
+def log_cloud_error(client, message, call_kwargs=None, **kwargs):
     """
     Log an azurerm cloud error exception
+
+    The keyword arguments of the calling function can be passed as a dictionary in ``call_kwargs`` instead of being
+    unpacked into this function, which avoids copying them. The message can be the exception itself, which is then
+    only converted to a string if the error is actually logged.
     """
+    if call_kwargs is not None:
+        kwargs = call_kwargs
+
     try:
         cloud_logger = getattr(log, kwargs.get("azurerm_log_level"))
     except (AttributeError, TypeError):
@@ -195,19 +587,113 @@ def log_cloud_error(client, message, **kwargs):
     )
 
 
+def operation_kwargs(kwargs):
+    """
+    Return the keyword arguments of a module function which can be passed on to the operations of a management
+    client, leaving out the credentials, the client options and the job details passed by Salt.
+    """
+    return {key: value for key, value in kwargs.items() if key in OPERATION_KWARGS}
+
+
+def lro_operation_kwargs(kwargs):
+    """
+    Return the keyword arguments of a module function which can be passed on to the long-running ``begin_*``
+    operations of a management client. Unlike ``operation_kwargs``, this includes the polling options.
+    """
+    return {key: value for key, value in kwargs.items() if key in LRO_OPERATION_KWARGS}
+
+
 def paged_object_to_list(paged_object):
     """
     Extract all pages within a paged object as a list of dictionaries
     """
-    paged_return = []
-    while True:
-        try:
-            page = next(paged_object)
-            paged_return.append(page.as_dict())
-        except StopIteration:
-            break
+    return list(iter_paged_object(paged_object))
+
+
+def iter_paged_object(paged_object):
+    """
+    Lazily yield the items within a paged object as dictionaries. Further pages are only requested once the items of
+    the previous page have been consumed.
+    """
+    for item in paged_object:
+        yield item.as_dict()
+
+
+def paged_object_to_dict(paged_object, key="name", convert=None):
+    """
+    Extract all pages within a paged object as a dictionary of dictionaries, keyed by the ``key``
+    attribute of each item. The next page is requested in the background while the items of the
+    current page are converted, so that the conversion overlaps the round trip for the next page.
+
+    Items are converted with their ``as_dict`` method, unless another function is passed with
+    ``convert`` (for the models of the data plane SDKs, which do not have one).
+    """
+    if convert is None:
+        convert = methodcaller("as_dict")
+    result = {}
+    for page in _prefetch_pages(paged_object):
+        result.update({getattr(item, key): convert(item) for item in page})
+    return result
+
+
+def _prefetch_pages(paged_object):
+    """
+    Yield the pages of a paged object as lists of items, requesting each page while the previous one
+    is being consumed. Iterables which cannot be split into pages are yielded as a single page.
+    """
+    if not hasattr(paged_object, "by_page"):
+        yield list(paged_object)
+        return
+
+    pages = paged_object.by_page()
+
+    def _next_page():
+        page = next(pages, None)
+        return None if page is None else list(page)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(_next_page)
+        while True:
+            page = future.result()
+            if page is None:
+                return
+            future = executor.submit(_next_page)
+            yield page
+
+
+def paged_response_to_dict(list_operation, *args, key="name", **kwargs):
+    """
+    Call a list operation of a management client with the given arguments, and return a dictionary of the items as
+    they are returned by the REST API, keyed by their ``key`` property. The JSON body of each page is collected with
+    a ``raw_response_hook`` and decoded directly (with ``orjson`` if it is installed) rather than converting every
+    item with ``as_dict``, which is much faster for large listings.
+
+    Note that the items keep the camel-cased names and nested ``properties`` of the REST API, which is a different
+    format from the one returned by ``paged_object_to_dict``.
+    """
+    result = {}
+
+    def _collect(pipeline_response):
+        response = pipeline_response.http_response
+        if not 200 <= response.status_code < 300:
+            return
+        body = response.body()
+        items = (orjson.loads(body) if HAS_ORJSON else json.loads(body)).get("value", [])
+        result.update((item[key], item) for item in items)
 
-    return paged_return
+    for _ in list_operation(*args, raw_response_hook=_collect, **kwargs):
+        pass
+
+    return result
+
+
+@functools.lru_cache(maxsize=None)
+def _model_class(module_name, object_name):
+    """
+    Import and return a model class of an Azure management package. Nested models are looked up for every object
+    built by ``create_object_model``, so each class is only looked up once.
+    """
+    return getattr(importlib.import_module(f"azure.mgmt.{module_name}.models"), object_name)
 
 
 def create_object_model(module_name, object_name, **kwargs):
@@ -217,15 +703,13 @@ def create_object_model(module_name, object_name, **kwargs):
     object_kwargs = {}
 
     try:
-        model_module = importlib.import_module(f"azure.mgmt.{module_name}.models")
-        # pylint: disable=invalid-name
-        Model = getattr(model_module, object_name)
+        Model = _model_class(module_name, object_name)  # pylint: disable=invalid-name
     except ImportError:
         raise sys.exit(  # pylint: disable=raise-missing-from
             f"The {object_name} model in the {module_name} Azure module is not available."
         )
 
-    if "_attribute_map" in dir(Model):
+    if hasattr(Model, "_attribute_map"):
         for attr, items in Model._attribute_map.items():  # pylint: disable=protected-access
             param = kwargs.get(attr)
             if param is not None:
@@ -319,6 +803,13 @@ def get_identity_credentials(**kwargs):
     the DefaultAzureCredential object to correctly parse those environment variables. See the
     `Microsoft Docs on EnvironmentCredential <https://aka.ms/azsdk-python-identity-default-cred-ref>`_
     for more information.
+
+    If ``persistent_token_cache`` is set to True and service principal credentials (``tenant``,
+    ``client_id`` and ``secret``) are provided, a ``ClientSecretCredential`` backed by a persistent
+    token cache is returned instead. Access tokens are then reused across short-lived processes such
+    as ``salt-call`` invocations. The cache is encrypted by default, which requires a supported secret
+    store on the host. Set ``allow_unencrypted_token_cache`` to True to fall back to an unencrypted
+    cache file on hosts without one.
     """
     kwarg_map = {
         "tenant": "AZURE_TENANT_ID",
@@ -344,6 +835,21 @@ def get_identity_credentials(**kwargs):
         log.error('Unknown authority presented for "cloud_environment": %s', exc)
         authority = KnownAuthorities.AZURE_PUBLIC_CLOUD
 
+    if kwargs.get("persistent_token_cache") and all(
+        kwargs.get(keyword) for keyword in ("tenant", "client_id", "secret")
+    ):
+        cache_options = TokenCachePersistenceOptions(
+            name="saltext-azurerm",
+            allow_unencrypted_storage=bool(kwargs.get("allow_unencrypted_token_cache", False)),
+        )
+        return ClientSecretCredential(
+            tenant_id=kwargs["tenant"],
+            client_id=kwargs["client_id"],
+            client_secret=kwargs["secret"],
+            authority=authority,
+            cache_persistence_options=cache_options,
+        )
+
     try:
         credential = DefaultAzureCredential(authority=authority)
     except ClientAuthenticationError:
@@ -352,3 +858,150 @@ def get_identity_credentials(**kwargs):
         )
 
     return credential
+
+
+class ClampedARMPolling(ARMPolling):
+    """
+    Polling method for long-running operations which never waits longer than ``max_delay`` seconds between status
+    checks, even when the service asks for a longer delay with a Retry-After header. It is passed to the ``begin_*``
+    operations of the management clients with the ``polling`` keyword argument.
+    """
+
+    def __init__(self, timeout=30, max_delay=None, **kwargs):
+        super().__init__(timeout=timeout, **kwargs)
+        self._max_delay = max_delay
+
+    def _extract_delay(self):
+        delay = super()._extract_delay()
+        if delay is not None and self._max_delay is not None:
+            delay = min(delay, self._max_delay)
+        return delay
+
+
+class JitteredRetryPolicy(RetryPolicy):
+    """
+    Retry policy which adds a random jitter of up to ``jitter`` seconds to the exponential backoff between retries,
+    so that concurrent requests which were throttled together do not all retry at the same moment. Delays requested
+    by the service with a Retry-After header are used as they are.
+    """
+
+    def __init__(self, jitter=RETRY_JITTER, **kwargs):
+        super().__init__(**kwargs)
+        self._jitter = jitter
+
+    def get_backoff_time(self, settings):
+        # some azure-core releases ignore retry_backoff_max when configuring the retries of a request
+        backoff = min(super().get_backoff_time(settings), self.backoff_max)
+        return backoff + random.uniform(0, self._jitter)
+
+
+def submit_with_context(executor, func, *args, **kwargs):
+    """
+    Submit a callable to a ``concurrent.futures`` executor so that it runs within a copy of the
+    calling thread's context. Salt exposes the loader dunders (``__salt__``, ``__opts__``, etc.)
+    through context variables, which are not inherited by executor threads.
+    """
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+def _response_json(response):
+    """
+    Decode the JSON body of a response, with ``orjson`` if it is installed
+    """
+    if HAS_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _retry_after(headers, default=BATCH_DEFAULT_RETRY_AFTER):
+    """
+    Return the number of seconds to wait according to the Retry-After header of a response, which is either a number
+    of seconds or an HTTP date. The default is returned if the header is missing or cannot be parsed.
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return default
+
+    try:
+        return max(0, int(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+    return max(0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+def batch_get(urls, **kwargs):
+    """
+    Issue multiple GET requests to Azure Resource Manager through the batch endpoint. Each batch request
+    is evaluated against the subscription's read limits once, instead of once per resource.
+
+    The URLs must be relative to the Resource Manager endpoint and include an ``api-version`` query
+    parameter, for example ``/subscriptions/{id}/resourcegroups/{name}?api-version=2021-04-01``.
+
+    A list of the response bodies is returned in the same order as the requested URLs. Individual
+    requests which failed, or whose batch was not processed within ``BATCH_MAX_WAIT`` seconds, are
+    represented by a dictionary containing an ``error`` key.
+    """
+    pipeline = get_client("resource", **kwargs)._client  # pylint: disable=protected-access
+    results = []
+
+    for offset in range(0, len(urls), BATCH_MAX_REQUESTS):
+        chunk = urls[offset : offset + BATCH_MAX_REQUESTS]
+        request = HttpRequest(
+            "POST",
+            pipeline.format_url("/batch"),
+            params={"api-version": BATCH_API_VERSION},
+            json={
+                "requests": [
+                    {"httpMethod": "GET", "name": str(index), "url": url}
+                    for index, url in enumerate(chunk)
+                ]
+            },
+        )
+        response = pipeline.send_request(request)
+
+        # Large batches may be processed asynchronously
+        deadline = time.monotonic() + BATCH_MAX_WAIT
+        while response.status_code == 202:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(_retry_after(response.headers), remaining))
+            response = pipeline.send_request(HttpRequest("GET", response.headers["Location"]))
+
+        if response.status_code == 202:
+            log.error("The batch request was not processed within %s seconds.", BATCH_MAX_WAIT)
+            results.extend(
+                {"error": f"The request to {url} was not processed in {BATCH_MAX_WAIT} seconds."}
+                for url in chunk
+            )
+            continue
+        response.raise_for_status()
+
+        responses = {
+            item.get("name"): item for item in _response_json(response).get("responses", [])
+        }
+        for index, url in enumerate(chunk):
+            item = responses.get(str(index), {})
+            status = item.get("httpStatusCode", 500)
+            content = item.get("content") or {}
+            if 200 <= status < 300:
+                results.append(content)
+            else:
+                error = content.get("error") or {}
+                results.append(
+                    {
+                        "error": error.get(
+                            "message", f"The request to {url} returned status {status}."
+                        )
+                    }
+                )
+
+    return results
@@ -0,0 +1 @@
+__version__ = "0.1.dev120+g49f7e03ed.d20261016"
\ No newline at end of file
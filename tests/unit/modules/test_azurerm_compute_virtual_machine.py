@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from azure.core.exceptions import ResourceNotFoundError
+
+import saltext.azurerm.modules.azurerm_compute_virtual_machine as azurerm_vm
+
+NIC_ID = (
+    "/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Network/networkInterfaces/vm1-nic0"
+)
+
+
+@pytest.fixture()
+def nic_create():
+    return MagicMock(return_value={"id": NIC_ID})
+
+
+@pytest.fixture()
+def configure_loader_modules(nic_create):
+    return {
+        azurerm_vm: {
+            "__salt__": {
+                "azurerm_network.network_interface_create_or_update": nic_create,
+                "azurerm_network.public_ip_address_create_or_update": MagicMock(),
+            }
+        }
+    }
+
+
+@pytest.fixture()
+def compconn():
+    compconn = MagicMock()
+    compconn._config.subscription_id = "sub"  # pylint: disable=protected-access
+    return compconn
+
+
+def test_create_or_update_creates_interface(compconn, nic_create):
+    compconn.virtual_machines.get.side_effect = ResourceNotFoundError("not found")
+
+    with (
+        patch("saltext.azurerm.utils.azurerm.get_client", return_value=compconn),
+        patch.object(azurerm_vm, "_prefetch", return_value={"location": "eastus"}),
+    ):
+        ret = azurerm_vm.create_or_update(
+            "vm1", "rg", "Standard_B1s", virtual_network="vnet", subnet="default", wait=False
+        )
+
+    assert ret["name"] == "vm1"
+    nic_create.assert_called_once()
+    assert nic_create.call_args.args == (
+        "vm1-nic0",
+        [{"name": "vm1-nic0-cfg0"}],
+        "default",
+        "vnet",
+        "rg",
+    )
+    parameters = compconn.virtual_machines.begin_create_or_update.call_args.kwargs["parameters"]
+    assert parameters.network_profile.network_interfaces[0].id == NIC_ID
+
+
+def test_create_or_update_unchanged(compconn, nic_create):
+    current = MagicMock()
+    current.as_dict.side_effect = lambda: {
+        "location": "eastus",
+        "hardware_profile": {"vm_size": "standard_b1s"},
+        "storage_profile": {
+            "os_disk": {"create_option": "FromImage", "disk_size_gb": 30},
+            "data_disks": [],
+        },
+        "os_profile": {"computer_name": "vm1", "admin_username": "salt"},
+        "network_profile": {"network_interfaces": [{"id": NIC_ID}]},
+    }
+    compconn.virtual_machines.get.return_value = current
+
+    with (
+        patch("saltext.azurerm.utils.azurerm.get_client", return_value=compconn),
+        patch.object(azurerm_vm, "_prefetch", return_value={"location": "eastus"}),
+        patch.object(azurerm_vm, "_get_network_interfaces", return_value=[]),
+    ):
+        ret = azurerm_vm.create_or_update(
+            "vm1", "rg", "Standard_B1s", virtual_network="vnet", subnet="default"
+        )
+
+    assert ret["location"] == "eastus"
+    nic_create.assert_not_called()
+    compconn.virtual_machines.begin_create_or_update.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "desired,current,expected",
+    [
+        ({"tags": {"a": "1"}}, {"tags": {"a": "1"}, "id": "vm"}, True),
+        ({"tags": {}}, {}, True),
+        ({"tags": {}}, {"tags": {"a": "1"}}, False),
+        ({}, {"tags": {"a": "1"}}, False),
+        ({"os_profile": {"computer_name": "VM1"}}, {"os_profile": {"computer_name": "vm1"}}, True),
+    ],
+)
+def test_matches(desired, current, expected):
+    # pylint: disable=protected-access
+    replaced_keys = azurerm_vm._REPLACED_KEYS
+    assert azurerm_vm._matches(desired, current, replaced_keys=replaced_keys) is expected
+
+
+def test_bulk_create_or_update():
+    vm_specs = [
+        {"name": "vm1", "resource_group": "rg1", "vm_size": "Standard_B1s"},
+        {"name": "vm1", "resource_group": "rg2", "vm_size": "Standard_B1s"},
+    ]
+
+    with patch.object(
+        azurerm_vm, "create_or_update", side_effect=lambda **params: params["resource_group"]
+    ) as create_or_update:
+        ret = azurerm_vm.bulk_create_or_update(vm_specs, subscription_id="sub")
+
+    assert ret == {"rg1/vm1": "rg1", "rg2/vm1": "rg2"}
+    assert create_or_update.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "vm_specs",
+    [
+        [
+            {"name": "vm1", "resource_group": "rg", "vm_size": "Standard_B1s"},
+            {"resource_group": "rg", "vm_size": "Standard_B1s"},
+        ],
+        [
+            {"name": "vm1", "resource_group": "rg", "vm_size": "Standard_B1s"},
+            {"name": "vm1", "resource_group": "rg", "vm_size": "Standard_B2s"},
+        ],
+    ],
+)
+def test_bulk_create_or_update_invalid(vm_specs):
+    with patch.object(azurerm_vm, "create_or_update") as create_or_update:
+        ret = azurerm_vm.bulk_create_or_update(vm_specs)
+
+    assert "error" in ret
+    create_or_update.assert_not_called()
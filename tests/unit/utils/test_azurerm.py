@@ -1,8 +1,15 @@
+import contextvars
+import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
+import requests
+from azure.core.paging import ItemPaged
+from azure.core.pipeline.transport import RequestsTransport
 from azure.mgmt.resource.resources import ResourceManagementClient
 
 import saltext.azurerm.utils.azurerm
@@ -70,6 +77,19 @@ def test_log_cloud_error():
         mock_info.assert_called_once_with(
             "An Azure Resource Manager %s ResourceNotFoundError has occurred: %s", "Foo", "bar"
         )
+        saltext.azurerm.utils.azurerm.log_cloud_error(
+            client, message, {"azurerm_log_level": "info"}
+        )
+        assert mock_info.call_count == 2
+        assert mock_error.call_count == 1
+
+        # exceptions are handed to the logger as is and only formatted when emitted
+        exc = MagicMock()
+        saltext.azurerm.utils.azurerm.log_cloud_error(client, exc, azurerm_log_level="info")
+        mock_info.assert_called_with(
+            "An Azure Resource Manager %s ResourceNotFoundError has occurred: %s", "Foo", exc
+        )
+        exc.__str__.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -100,6 +120,321 @@ def test_get_client(client_type, client_object, mock_determine_auth):
             assert f"{client_object}Client" in str(client)
 
 
+def test_get_client_transport(mock_determine_auth):
+    transport = RequestsTransport()
+    with patch("saltext.azurerm.utils.azurerm._determine_auth", mock_determine_auth):
+        client = saltext.azurerm.utils.azurerm.get_client("resource", transport=transport)
+    assert client._client._pipeline._transport is transport  # pylint: disable=protected-access
+    assert "transport" not in mock_determine_auth.call_args.kwargs
+
+
+def test_get_client_shared_transport(mock_determine_auth):
+    with (
+        patch.dict(saltext.azurerm.utils.azurerm._CLIENT_CACHE, clear=True),
+        patch("saltext.azurerm.utils.azurerm._determine_auth", mock_determine_auth),
+        patch("saltext.azurerm.utils.azurerm._warm_connection") as warm_connection,
+    ):
+        resource = saltext.azurerm.utils.azurerm.get_client("resource", subscription_id="sub")
+        compute = saltext.azurerm.utils.azurerm.get_client("compute", subscription_id="sub")
+        dns = saltext.azurerm.utils.azurerm.get_client("dns", subscription_id="sub")
+        privatedns = saltext.azurerm.utils.azurerm.get_client("privatedns", subscription_id="sub")
+
+        # pylint: disable=protected-access
+        transport = resource._client._pipeline._transport
+        assert compute._client._pipeline._transport is transport
+        assert dns._client._pipeline._transport is transport
+        assert privatedns._client._pipeline._transport is transport
+
+        # no connection is opened ahead of the first request unless requested
+        warm_connection.assert_not_called()
+
+        # closing one client does not close the session used by the others
+        resource.close()
+        assert transport.session is not None
+
+
+def test_get_client_warm_connection(mock_determine_auth):
+    with (
+        patch.dict(saltext.azurerm.utils.azurerm._CLIENT_CACHE, clear=True),
+        patch.dict(os.environ, {"SALTEXT_AZURERM_WARM_CONNECTION": "1"}),
+        patch("saltext.azurerm.utils.azurerm._determine_auth", mock_determine_auth),
+        patch("saltext.azurerm.utils.azurerm._warm_connection") as warm_connection,
+    ):
+        client = saltext.azurerm.utils.azurerm.get_client("resource", subscription_id="sub")
+
+    # a connection to the Resource Manager endpoint is opened in the pool of the shared session
+    transport = client._client._pipeline._transport  # pylint: disable=protected-access
+    warm_connection.assert_called_once_with(transport.session, "http://localhost/someurl")
+
+
+def test_get_client_compressed_responses(credentials, subscription_id):
+    cloud_env = MagicMock()
+    cloud_env.endpoints.resource_manager = "https://management.azure.com"
+    response = requests.Response()
+    response.status_code = 204
+    response.raw = MagicMock()
+    response._content = b""  # pylint: disable=protected-access
+
+    with (
+        patch.dict(saltext.azurerm.utils.azurerm._CLIENT_CACHE, clear=True),
+        patch(
+            "saltext.azurerm.utils.azurerm._determine_auth",
+            return_value=(credentials, subscription_id, cloud_env),
+        ),
+    ):
+        client = saltext.azurerm.utils.azurerm.get_client("resource", subscription_id="sub")
+        # pylint: disable=protected-access
+        session = client._client._pipeline._transport.session
+        with patch.object(session, "send", return_value=response) as send:
+            assert client.resource_groups.check_existence("testgroup")
+
+    # the request sent through the client pipeline asks for a compressed response
+    assert "gzip" in send.call_args.args[0].headers["Accept-Encoding"]
+
+
+def test_get_client_cache(mock_determine_auth):
+    with (
+        patch.dict(saltext.azurerm.utils.azurerm._CLIENT_CACHE, clear=True),
+        patch("saltext.azurerm.utils.azurerm._determine_auth", mock_determine_auth),
+    ):
+        client = saltext.azurerm.utils.azurerm.get_client(
+            "resource", subscription_id="sub", secret="first-secret"
+        )
+        assert (
+            saltext.azurerm.utils.azurerm.get_client(
+                "resource", subscription_id="sub", secret="first-secret"
+            )
+            is client
+        )
+        assert mock_determine_auth.call_count == 1
+
+        # a different client type or different credentials build a new client
+        assert (
+            saltext.azurerm.utils.azurerm.get_client("compute", subscription_id="sub") is not client
+        )
+        assert (
+            saltext.azurerm.utils.azurerm.get_client(
+                "resource", subscription_id="sub", secret="second-secret"
+            )
+            is not client
+        )
+        assert (
+            saltext.azurerm.utils.azurerm.get_client(
+                "resource",
+                subscription_id="sub",
+                secret="first-secret",
+                cloud_environment="AZURE_US_GOV_CLOUD",
+            )
+            is not client
+        )
+        assert mock_determine_auth.call_count == 4
+
+        # secrets are not kept in the cache keys
+        assert "first-secret" not in str(list(saltext.azurerm.utils.azurerm._CLIENT_CACHE))
+
+        with patch.object(client, "close") as mock_close:
+            saltext.azurerm.utils.azurerm.clear_client_cache()
+        mock_close.assert_called_once()
+        assert not saltext.azurerm.utils.azurerm._CLIENT_CACHE
+
+
+def test_get_client_cache_disabled(mock_determine_auth):
+    with (
+        patch.dict(saltext.azurerm.utils.azurerm._CLIENT_CACHE, clear=True),
+        patch.dict(os.environ, {"SALTEXT_AZURERM_CLIENT_CACHE": "0"}),
+        patch("saltext.azurerm.utils.azurerm._determine_auth", mock_determine_auth),
+    ):
+        client = saltext.azurerm.utils.azurerm.get_client("resource", subscription_id="sub")
+        assert (
+            saltext.azurerm.utils.azurerm.get_client("resource", subscription_id="sub")
+            is not client
+        )
+        assert mock_determine_auth.call_count == 2
+        assert not saltext.azurerm.utils.azurerm._CLIENT_CACHE
+
+
+def test_get_vault_client():
+    mock_client_class = MagicMock()
+    mock_credentials = MagicMock()
+    with (
+        patch.dict(saltext.azurerm.utils.azurerm._CLIENT_CACHE, clear=True),
+        patch("saltext.azurerm.utils.azurerm.get_identity_credentials", mock_credentials),
+    ):
+        client = saltext.azurerm.utils.azurerm.get_vault_client(
+            mock_client_class, "https://vault1.vault.azure.net/", secret="first-secret"
+        )
+        assert (
+            saltext.azurerm.utils.azurerm.get_vault_client(
+                mock_client_class, "https://vault1.vault.azure.net/", secret="first-secret"
+            )
+            is client
+        )
+        mock_client_class.assert_called_once_with(
+            vault_url="https://vault1.vault.azure.net/",
+            credential=mock_credentials.return_value,
+            transport=saltext.azurerm.utils.azurerm._shared_transport(),
+        )
+        mock_credentials.assert_called_once_with(secret="first-secret")
+
+        # another vault or different credentials build a new client
+        saltext.azurerm.utils.azurerm.get_vault_client(
+            mock_client_class, "https://vault2.vault.azure.net/", secret="first-secret"
+        )
+        saltext.azurerm.utils.azurerm.get_vault_client(
+            mock_client_class, "https://vault1.vault.azure.net/", secret="second-secret"
+        )
+        assert mock_client_class.call_count == 3
+        assert "first-secret" not in str(list(saltext.azurerm.utils.azurerm._CLIENT_CACHE))
+
+        with patch.dict(os.environ, {"SALTEXT_AZURERM_CLIENT_CACHE": "0"}):
+            saltext.azurerm.utils.azurerm.get_vault_client(
+                mock_client_class, "https://vault1.vault.azure.net/", secret="first-secret"
+            )
+        assert mock_client_class.call_count == 4
+        assert len(saltext.azurerm.utils.azurerm._CLIENT_CACHE) == 3
+
+
+def test_clamped_arm_polling():
+    polling = saltext.azurerm.utils.azurerm.ClampedARMPolling(timeout=5, max_delay=5)
+    polling._pipeline_response = MagicMock()
+
+    # the delay requested by the service is clamped
+    polling._pipeline_response.http_response.headers = {"Retry-After": "30"}
+    assert polling._extract_delay() == 5
+
+    # shorter delays requested by the service are kept
+    polling._pipeline_response.http_response.headers = {"Retry-After": "2"}
+    assert polling._extract_delay() == 2
+
+    # the polling interval is used without a requested delay
+    polling._pipeline_response.http_response.headers = {}
+    assert polling._extract_delay() == 5
+
+
+def test_jittered_retry_policy(mock_determine_auth):
+    policy = saltext.azurerm.utils.azurerm.JitteredRetryPolicy(
+        jitter=0.5, retry_backoff_factor=0.25, retry_backoff_max=20
+    )
+    settings = policy.configure_retries({})
+
+    for attempts, backoff in ((1, 0), (3, 1), (10, 20)):
+        settings["history"] = [None] * attempts
+        assert backoff <= policy.get_backoff_time(settings) <= backoff + 0.5
+
+    with (
+        patch.dict(saltext.azurerm.utils.azurerm._CLIENT_CACHE, clear=True),
+        patch("saltext.azurerm.utils.azurerm._determine_auth", mock_determine_auth),
+    ):
+        client = saltext.azurerm.utils.azurerm.get_client("compute", subscription_id="sub")
+        # pylint: disable=protected-access
+        assert isinstance(
+            client._config.retry_policy, saltext.azurerm.utils.azurerm.JitteredRetryPolicy
+        )
+        assert client._config.retry_policy.total_retries == 5
+
+
+def test_ttl_cache():
+    calls = []
+
+    @saltext.azurerm.utils.azurerm.ttl_cache(ttl=60, maxsize=2)
+    def _lookup(name, **kwargs):
+        calls.append(name)
+        if name == "bad":
+            return {"error": "failed"}
+        return {"name": name}
+
+    assert _lookup("one", secret="first-secret") == {"name": "one"}
+    assert _lookup("one", secret="first-secret") == {"name": "one"}
+    assert calls == ["one"]
+
+    # callers cannot modify the cached results
+    _lookup("one", secret="first-secret")["name"] = "changed"
+    assert _lookup("one", secret="first-secret") == {"name": "one"}
+
+    # different arguments and errors are not served from the cache
+    _lookup("one", secret="second-secret")
+    _lookup("bad")
+    _lookup("bad")
+    assert calls == ["one", "one", "bad", "bad"]
+
+    # the least recently used result is discarded
+    _lookup("two")
+    _lookup("one", secret="first-secret")
+    assert calls == ["one", "one", "bad", "bad", "two", "one"]
+
+    # expired results are looked up again
+    with patch("time.monotonic", return_value=time.monotonic() + 120):
+        _lookup("two")
+    assert calls[-1] == "two"
+
+    _lookup.cache_clear()
+    _lookup("two")
+    assert calls[-1] == "two" and calls.count("two") == 3
+
+
+def test_get_operation_group(mock_determine_auth):
+    with (
+        patch.dict(saltext.azurerm.utils.azurerm._CLIENT_CACHE, clear=True),
+        patch("saltext.azurerm.utils.azurerm._determine_auth", mock_determine_auth),
+    ):
+        client = saltext.azurerm.utils.azurerm.get_client("compute", subscription_id="sub")
+
+    group = saltext.azurerm.utils.azurerm.get_operation_group(client, "virtual_machine_images")
+    assert group is not client.virtual_machine_images
+    assert (
+        saltext.azurerm.utils.azurerm.get_operation_group(client, "virtual_machine_images") is group
+    )
+
+
+def test_get_api_version():
+    client = MagicMock()
+    client._get_api_version.return_value = "2022-03-01"
+
+    for _ in range(2):
+        assert (
+            saltext.azurerm.utils.azurerm.get_api_version(client, "virtual_machine_images")
+            == "2022-03-01"
+        )
+
+    client._get_api_version.assert_called_once_with("virtual_machine_images")
+
+
+def test_has_modules():
+    assert saltext.azurerm.utils.azurerm.has_modules("azure.mgmt.dns", "azure.mgmt.privatedns")
+    assert not saltext.azurerm.utils.azurerm.has_modules("azure.mgmt.dns", "azure.mgmt.missing")
+    assert not saltext.azurerm.utils.azurerm.has_modules("missing_package.module")
+
+
+def test_operation_kwargs():
+    kwargs = {
+        "subscription_id": "sub",
+        "secret": "secret",
+        "azurerm_log_level": "info",
+        "__pub_jid": "1",
+        "headers": {"x-ms-test": "1"},
+        "timeout": 30,
+        "polling_interval": 5,
+    }
+    assert saltext.azurerm.utils.azurerm.operation_kwargs(kwargs) == {
+        "headers": {"x-ms-test": "1"},
+        "timeout": 30,
+    }
+
+
+def test_lro_operation_kwargs():
+    kwargs = {
+        "subscription_id": "sub",
+        "headers": {"x-ms-test": "1"},
+        "polling": False,
+        "polling_interval": 5,
+    }
+    assert saltext.azurerm.utils.azurerm.lro_operation_kwargs(kwargs) == {
+        "headers": {"x-ms-test": "1"},
+        "polling": False,
+        "polling_interval": 5,
+    }
+
+
 def test_paged_object_to_list():
     models = ResourceManagementClient.models()
 
@@ -125,6 +460,86 @@ def test_paged_object_to_list():
     ]
 
 
+def test_paged_object_to_dict():
+    models = ResourceManagementClient.models()
+    requested = []
+    pages = {
+        None: ("page1", ["rg1", "rg2"]),
+        "page1": ("page2", ["rg3"]),
+        "page2": (None, ["rg4"]),
+    }
+
+    def _get_next(continuation_token):
+        requested.append(continuation_token)
+        return continuation_token
+
+    def _extract_data(continuation_token):
+        next_token, names = pages[continuation_token]
+        return next_token, [models.ResourceGroup(location=name) for name in names]
+
+    paged_return = saltext.azurerm.utils.azurerm.paged_object_to_dict(
+        ItemPaged(_get_next, _extract_data), key="location"
+    )
+
+    assert requested == [None, "page1", "page2"]
+    assert paged_return == {name: {"location": name} for name in ("rg1", "rg2", "rg3", "rg4")}
+
+    # iterables without pages are converted as well
+    assert saltext.azurerm.utils.azurerm.paged_object_to_dict(
+        [models.ResourceGroup(location="eastus")], key="location"
+    ) == {"eastus": {"location": "eastus"}}
+
+    # items without an as_dict method are converted by the function passed with convert
+    assert saltext.azurerm.utils.azurerm.paged_object_to_dict(
+        ItemPaged(_get_next, _extract_data), key="location", convert=lambda item: item.location
+    ) == {name: name for name in ("rg1", "rg2", "rg3", "rg4")}
+
+
+def test_paged_response_to_dict():
+    pages = [
+        [{"name": "rg1", "properties": {"provisioningState": "Succeeded"}}],
+        [{"name": "rg2", "managedBy": "me"}],
+    ]
+
+    def _response(status_code, body):
+        response = MagicMock()
+        response.http_response.status_code = status_code
+        response.http_response.body.return_value = body
+        return response
+
+    def _list(resource_group_name, raw_response_hook):
+        assert resource_group_name == "rg"
+        # responses which failed, e.g. before being retried, are not collected
+        raw_response_hook(_response(503, b"Service Unavailable"))
+        for page in pages:
+            raw_response_hook(_response(200, json.dumps({"value": page}).encode()))
+            yield from page
+
+    assert saltext.azurerm.utils.azurerm.paged_response_to_dict(
+        _list, resource_group_name="rg"
+    ) == {
+        "rg1": {"name": "rg1", "properties": {"provisioningState": "Succeeded"}},
+        "rg2": {"name": "rg2", "managedBy": "me"},
+    }
+
+
+def test_iter_paged_object():
+    models = ResourceManagementClient.models()
+    consumed = []
+
+    def _r_groups():
+        for location in ("eastus", "westus"):
+            consumed.append(location)
+            yield models.ResourceGroup(location=location)
+
+    paged_iter = saltext.azurerm.utils.azurerm.iter_paged_object(_r_groups())
+
+    assert not consumed
+    assert next(paged_iter) == {"location": "eastus"}
+    assert consumed == ["eastus"]
+    assert list(paged_iter) == [{"location": "westus"}]
+
+
 def test_create_object_model():
     obj = saltext.azurerm.utils.azurerm.create_object_model(
         "network",
@@ -248,3 +663,129 @@ def test_get_identity_credentials():
         kwargs["cloud_environment"] = "THIS_CLOUD_IS_FAKE"
         saltext.azurerm.utils.azurerm.get_identity_credentials(**kwargs)
         assert mock_credential.call_args.kwargs["authority"] == "login.microsoftonline.com"
+
+
+def test_get_identity_credentials_persistent_token_cache():
+    kwargs = {
+        "tenant": "test_tenant_id",
+        "client_id": "test_client_id",
+        "secret": "test_secret",
+        "persistent_token_cache": True,
+    }
+
+    mock_default_credential = MagicMock()
+    mock_secret_credential = MagicMock()
+    mock_os_environ = {}
+
+    with (
+        patch("saltext.azurerm.utils.azurerm.DefaultAzureCredential", mock_default_credential),
+        patch("saltext.azurerm.utils.azurerm.ClientSecretCredential", mock_secret_credential),
+        patch.object(os, "environ", mock_os_environ),
+    ):
+        saltext.azurerm.utils.azurerm.get_identity_credentials(**kwargs)
+
+        mock_default_credential.assert_not_called()
+        call_kwargs = mock_secret_credential.call_args.kwargs
+        assert call_kwargs["tenant_id"] == "test_tenant_id"
+        assert call_kwargs["client_id"] == "test_client_id"
+        assert call_kwargs["client_secret"] == "test_secret"
+        assert call_kwargs["authority"] == "login.microsoftonline.com"
+        assert call_kwargs["cache_persistence_options"].name == "saltext-azurerm"
+        assert not call_kwargs["cache_persistence_options"].allow_unencrypted_storage
+
+        kwargs["allow_unencrypted_token_cache"] = True
+        saltext.azurerm.utils.azurerm.get_identity_credentials(**kwargs)
+        call_kwargs = mock_secret_credential.call_args.kwargs
+        assert call_kwargs["cache_persistence_options"].allow_unencrypted_storage
+
+        # without a full service principal the default credential chain is used
+        kwargs.pop("secret")
+        saltext.azurerm.utils.azurerm.get_identity_credentials(**kwargs)
+        mock_default_credential.assert_called_once()
+
+
+def test_submit_with_context():
+    test_var = contextvars.ContextVar("test_var", default=None)
+    test_var.set("parent")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        plain = executor.submit(test_var.get)
+        future = saltext.azurerm.utils.azurerm.submit_with_context(executor, test_var.get)
+
+        assert plain.result() is None
+        assert future.result() == "parent"
+
+
+def test_batch_get():
+    urls = [
+        f"/subscriptions/sub/resourcegroups/rg{num}?api-version=2021-04-01" for num in range(25)
+    ]
+
+    def send_request(request):
+        requests = json.loads(request.content)
+        response = MagicMock(status_code=200)
+        body = {
+            "responses": [
+                {
+                    "name": item["name"],
+                    "httpStatusCode": 404 if item["url"] == urls[3] else 200,
+                    "content": (
+                        {"error": {"message": "not found"}}
+                        if item["url"] == urls[3]
+                        else {"id": item["url"].split("?")[0]}
+                    ),
+                }
+                for item in requests["requests"]
+            ]
+        }
+        response.json.return_value = body
+        response.content = json.dumps(body).encode()
+        return response
+
+    pipeline = MagicMock()
+    pipeline.format_url.return_value = "https://management.azure.com/batch"
+    pipeline.send_request.side_effect = send_request
+    client = MagicMock(_client=pipeline)
+
+    with patch("saltext.azurerm.utils.azurerm.get_client", return_value=client):
+        ret = saltext.azurerm.utils.azurerm.batch_get(urls, subscription_id="sub")
+
+    # 25 requests are split into batches of 20 and 5
+    assert pipeline.send_request.call_count == 2
+    assert len(ret) == 25
+    assert ret[0] == {"id": "/subscriptions/sub/resourcegroups/rg0"}
+    assert ret[3] == {"error": "not found"}
+    assert ret[24] == {"id": "/subscriptions/sub/resourcegroups/rg24"}
+
+
+def test_batch_get_timeout():
+    urls = ["/subscriptions/sub/resourcegroups/rg0?api-version=2021-04-01"]
+    pipeline = MagicMock()
+    pipeline.format_url.return_value = "https://management.azure.com/batch"
+    pipeline.send_request.return_value = MagicMock(
+        status_code=202,
+        headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT", "Location": "https://status"},
+    )
+    client = MagicMock(_client=pipeline)
+
+    with (
+        patch("saltext.azurerm.utils.azurerm.get_client", return_value=client),
+        patch("saltext.azurerm.utils.azurerm.BATCH_MAX_WAIT", 0.05),
+    ):
+        ret = saltext.azurerm.utils.azurerm.batch_get(urls, subscription_id="sub")
+
+    assert len(ret) == 1
+    assert "error" in ret[0]
+
+
+@pytest.mark.parametrize(
+    "headers,expected",
+    [
+        ({}, 1),
+        ({"Retry-After": "5"}, 5),
+        ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0),
+        ({"Retry-After": "soon"}, 1),
+    ],
+)
+def test_retry_after(headers, expected):
+    assert saltext.azurerm.utils.azurerm._retry_after(headers) == expected